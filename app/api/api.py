@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import products, auth
+from app.api.endpoints import products, auth, users
 
 # Create the main router
 api_router = APIRouter()
@@ -10,5 +10,5 @@ api_router.include_router(products.router, tags=["Products"])
 # Include the authentication router
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
-# You will add other routers here later
-# e.g., api_router.include_router(users.router, tags=["Users"])
\ No newline at end of file
+# Include the users router (the signed-in user's own listings)
+api_router.include_router(users.router, prefix="/users", tags=["Users"])
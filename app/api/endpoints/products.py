@@ -1,110 +1,100 @@
 # app/api/endpoints/products.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import List, Optional
-import cloudinary.uploader
-from PIL import Image
-import io
-import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import json
+import zlib
+from bson import ObjectId
+from pymongo import UpdateOne
+from beanie import UpdateResponse
 
 # Import the Beanie Document model and Pydantic schemas
 from app.models.product import Product
-from app.schema.product import ProductUpdate, ProductCreate, ProductResponse # You should move schemas here
-
-router = APIRouter()
-
-def compress_image(image_file: UploadFile, max_size_kb: int = 200) -> bytes:
-    """
-    Compress an image to a maximum file size while maintaining quality.
-    
-    Args:
-        image_file: The uploaded image file
-        max_size_mb: Maximum file size in MB (default: 0.75MB)
-    
-    Returns:
-        Compressed image as bytes
-    """
-    # Read the image
-    image_data = image_file.file.read()
-    image_file.file.seek(0)  # Reset file pointer for potential reuse
-    
-    # Open image with PIL
-    image = Image.open(io.BytesIO(image_data))
-    
-    # Convert to RGB if necessary (for JPEG compatibility)
-    if image.mode in ('RGBA', 'LA', 'P'):
-        # Create a white background
-        background = Image.new('RGB', image.size, (255, 255, 255))
-        if image.mode == 'P':
-            image = image.convert('RGBA')
-        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-        image = background
-    elif image.mode != 'RGB':
-        image = image.convert('RGB')
-    
-    # Start with a high quality and progressively reduce
-    quality = 90
-    output = io.BytesIO()
-
-    # Progressive compression: reduce quality first, then downscale if needed
-    attempts = 0
-    min_side_limit = 256  # do not downscale below this on the shortest side
-    while True:
-        attempts += 1
-        if attempts > 30:
-            break  # safety guard
-
-        output.seek(0)
-        output.truncate()
-        image.save(output, format='JPEG', quality=quality, optimize=True)
-
-        file_size_kb = len(output.getvalue()) // 1024
-        if file_size_kb <= max_size_kb:
-            break
-
-        # Reduce quality until 40, then start downscaling dimensions
-        if quality > 40:
-            quality -= 5
-            continue
+from app.models.user import User
+from app.schema.product import (  # You should move schemas here
+    ProductUpdate,
+    ProductCreate,
+    ProductResponse,
+    ProductFeedPage,
+    ProductSearchPage,
+    BulkProductCreate,
+    BulkProductUpdate,
+    BulkProductIds,
+    BulkItemResult,
+    BulkResult,
+)
+from app.core.pagination import InvalidCursor, encode_cursor, keyset_after
+from app.core.image_pool import ImagePipelineBusy
+from app.core.image_store import release_images, store_images
+from app.core.uploads import read_image_uploads
+from app.core.jobs import enqueue_image_job
+from app.core.events import (
+    EVICTED,
+    TooManySubscribers,
+    get_product_events,
+    publish_product_event,
+    publish_product_events,
+)
+from app.core.storage import UploadFailed
+from app.core.response_cache import product_cache
+from app.core.serialization import FastJSONResponse, PRODUCT_PROJECTION, dumps, product_to_api
+from app.core.config import get_settings
+from app.core.deps import get_current_user
 
-        # Downscale dimensions by 10% steps if still too large
-        new_width = int(image.width * 0.9)
-        new_height = int(image.height * 0.9)
-        if min(new_width, new_height) <= min_side_limit:
-            # As a last resort, allow quality to go down to 10
-            if quality > 10:
-                quality -= 5
-                continue
-            else:
-                break
-        image = image.resize((new_width, new_height), Image.LANCZOS)
-    
-    return output.getvalue()
+router = APIRouter(default_response_class=FastJSONResponse)
+
+# Upper bounds of the price facet buckets; prices above the last one share an open-ended bucket
+PRICE_BUCKETS = [0, 500, 1000, 2500, 5000, 10000]
 
-@router.post("/products", response_model=Product, tags=["Products"])
+def _product_filters(
+    category: Optional[str],
+    location: Optional[str],
+    is_sold: Optional[bool],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    tags: Optional[List[str]],
+) -> dict:
+    """Build the MongoDB filter shared by the feed and search endpoints"""
+    query = {}
+    if category is not None:
+        query["category"] = category
+    if location is not None:
+        query["location"] = location
+    if is_sold is not None:
+        query["is_sold"] = is_sold
+    if min_price is not None or max_price is not None:
+        price = {}
+        if min_price is not None:
+            price["$gte"] = min_price
+        if max_price is not None:
+            price["$lte"] = max_price
+        query["price"] = price
+    if tags:
+        query["tags"] = {"$in": tags}
+    return query
+
+@router.post("/products", response_model=ProductResponse, tags=["Products"])
 async def add_product(
+    response: Response,
     name: str = Form(...),
     price: float = Form(...),
     location: str = Form(...),
     category: str = Form(...),
     description: Optional[str] = Form(None),
-    images: List[UploadFile] = File(...)
+    images: List[UploadFile] = File(...),
+    user: User = Depends(get_current_user),
 ):
     """
-    Add a new product. Images are compressed and uploaded to Cloudinary.
-    """
-    image_urls = []
-    
-    for img in images:
-        # Compress the image to max 200KB
-        compressed_image_data = compress_image(img, max_size_kb=200)
-        
-        # Upload compressed image to Cloudinary
-        upload_result = cloudinary.uploader.upload(
-            io.BytesIO(compressed_image_data),
-            resource_type="image"
-        )
-        image_urls.append(upload_result["url"])
-
+    Add a new product listed by the current user. Each image is stored as full, medium and thumbnail
+    renditions (JPEG, plus WebP when smaller) in the image storage backend;
+    images uploaded before are reused instead of processed again.
+    With IMAGE_PROCESSING_MODE=async the product is created at once with
+    image_status "processing" (202) and its images are filled in later.
+    """
+    raw_images = await read_image_uploads(images)
     product_data = ProductCreate(
         name=name,
         price=price,
@@ -113,62 +103,344 @@ async def add_product(
         description=description
     )
 
+    if get_settings().IMAGE_PROCESSING_MODE == "async":
+        # Answer right away; a background job builds and stores the images
+        new_product = Product(
+            **product_data.dict(),
+            image_status="processing",
+            seller_id=str(user.id),
+        )
+        await new_product.insert()
+        try:
+            await enqueue_image_job(new_product.id, raw_images)
+        except BaseException:
+            await Product.get_motor_collection().update_one(
+                {"_id": new_product.id}, {"$set": {"image_status": "failed"}}
+            )
+            raise
+        finally:
+            await product_cache.invalidate()
+        response.status_code = 202
+        product = product_to_api(new_product.model_dump(by_alias=True))
+        publish_product_event("insert", new_product.id, product)
+        return product
+
+    # Identical files uploaded before are reused; new ones get their
+    # full/medium/thumb renditions built off the event loop and uploaded
+    try:
+        product_images, image_refs = await store_images(raw_images)
+    except ImagePipelineBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(get_settings().IMAGE_RETRY_AFTER_SECONDS)},
+        )
+    except UploadFailed as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
     new_product = Product(
         **product_data.dict(),
-        image_urls=image_urls,
-        seller_id="000000000000000000000000" # Placeholder for auth user (24-char ObjectId)
+        image_urls=[image.full.jpeg for image in product_images],
+        images=product_images,
+        image_refs=image_refs,
+        seller_id=str(user.id),
     )
 
-    await new_product.insert()
-    return new_product
+    try:
+        await new_product.insert()
+    except BaseException:
+        await release_images(image_refs)
+        raise
+    await product_cache.invalidate()
+    product = product_to_api(new_product.model_dump(by_alias=True))
+    publish_product_event("insert", new_product.id, product)
+    return product
+
+@router.get("/products", response_model=ProductFeedPage, tags=["Products"])
+async def get_home_feed(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    is_sold: Optional[bool] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    tags: Optional[List[str]] = Query(None),
+):
+    """
+    Get a page of the home feed, newest first.
+    Pass the returned next_cursor back as cursor to fetch the following page.
+    Responses are cached per query and support If-None-Match.
+    """
+    query = _product_filters(category, location, is_sold, min_price, max_price, tags)
+    # An explicit $in over both values lets the (…, is_sold, date_added, _id)
+    # indexes still serve the sort when the caller does not filter on is_sold.
+    query.setdefault("is_sold", {"$in": [False, True]})
+    if cursor:
+        try:
+            query.update(keyset_after(cursor))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def build() -> bytes:
+        # Fetch one extra row to know whether another page exists
+        docs = await (
+            Product.get_motor_collection()
+            .find(query, PRODUCT_PROJECTION)
+            .sort([("date_added", -1), ("_id", -1)])
+            .limit(limit + 1)
+            .to_list(length=limit + 1)
+        )
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            last = docs[-1]
+            next_cursor = encode_cursor(last["date_added"], last["_id"])
 
-@router.get("/products", response_model=List[ProductResponse], tags=["Products"])
-async def get_home_feed():
+        # Raw documents go straight to JSON bytes; the payload matches ProductFeedPage
+        return dumps({"items": [product_to_api(doc) for doc in docs], "next_cursor": next_cursor})
+
+    return await product_cache.respond(request, build)
+
+@router.get("/products/search", response_model=ProductSearchPage, tags=["Products"])
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    skip: int = Query(0, ge=0, le=1000),
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    is_sold: Optional[bool] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    tags: Optional[List[str]] = Query(None),
+):
     """
-    Get the home feed of all products.
+    Full-text search over name, tags and description, ranked by relevance.
+    Also returns category, location and price facet counts for all matches,
+    computed in the same aggregation.
     """
-    products = await Product.find_all().to_list()
-    return [ProductResponse.model_validate(p, from_attributes=True) for p in products]
+    match = {"$text": {"$search": q}}
+    match.update(_product_filters(category, location, is_sold, min_price, max_price, tags))
+
+    pipeline = [
+        {"$match": match},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$facet": {
+            "items": [
+                {"$sort": {"score": -1, "date_added": -1, "_id": -1}},
+                {"$skip": skip},
+                {"$limit": limit},
+            ],
+            "total": [{"$count": "count"}],
+            "category": [{"$sortByCount": "$category"}],
+            "location": [{"$sortByCount": "$location"}],
+            "price": [{"$bucket": {
+                "groupBy": "$price",
+                "boundaries": PRICE_BUCKETS,
+                "default": "above",
+                "output": {"count": {"$sum": 1}},
+            }}],
+        }},
+    ]
+
+    async def build() -> bytes:
+        results = await Product.get_motor_collection().aggregate(pipeline).to_list(length=1)
+        facets = results[0] if results else {}
+
+        price_buckets = []
+        for bucket in facets.get("price", []):
+            if bucket["_id"] == "above":
+                price_buckets.append({"min": float(PRICE_BUCKETS[-1]), "max": None, "count": bucket["count"]})
+            else:
+                upper = PRICE_BUCKETS[PRICE_BUCKETS.index(bucket["_id"]) + 1]
+                price_buckets.append({"min": float(bucket["_id"]), "max": float(upper), "count": bucket["count"]})
+
+        page = {
+            "items": [{**product_to_api(doc), "score": doc["score"]} for doc in facets.get("items", [])],
+            "total": facets["total"][0]["count"] if facets.get("total") else 0,
+            "facets": {
+                "category": [{"value": f["_id"], "count": f["count"]} for f in facets.get("category", [])],
+                "location": [{"value": f["_id"], "count": f["count"]} for f in facets.get("location", [])],
+                "price": price_buckets,
+            },
+        }
+        return dumps(page)
+
+    return await product_cache.respond(request, build)
+
+# Fields emitted by the catalog export, in addition to _id (renamed to id)
+EXPORT_FIELDS = ["name", "description", "price", "date_added", "seller_id", "image_urls", "images",
+                 "image_status", "location", "category", "tags", "is_sold", "revision"]
+
+def _export_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+@router.get("/products/export", tags=["Products"])
+async def export_products(
+    after: Optional[str] = Query(None, description="Resume after this product id (the last id received)"),
+    gzip: bool = Query(False, description="gzip-compress the stream"),
+    batch_size: int = Query(500, ge=1, le=5000),
+):
+    """
+    Stream the whole catalog as NDJSON (one product per line), ordered by id.
+    Memory use is constant: documents are read from a cursor in batches and
+    written out as they arrive. If the download breaks, call again with the
+    last received id as `after`.
+    """
+    query = {}
+    if after is not None:
+        if not ObjectId.is_valid(after):
+            raise HTTPException(status_code=400, detail="Invalid product id in after")
+        query["_id"] = {"$gt": ObjectId(after)}
+
+    cursor = (
+        Product.get_motor_collection()
+        .find(query, {field: 1 for field in EXPORT_FIELDS})
+        .sort("_id", 1)
+        .batch_size(batch_size)
+    )
+
+    async def lines():
+        compressor = zlib.compressobj(wbits=31) if gzip else None  # wbits=31: gzip container
+        chunk = []
+        async for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            chunk.append(json.dumps(doc, default=_export_default, separators=(",", ":")))
+            if len(chunk) >= batch_size:
+                data = ("\n".join(chunk) + "\n").encode()
+                chunk = []
+                # Sync-flush each batch so compressed output keeps streaming too
+                yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+        data = ("\n".join(chunk) + "\n").encode() if chunk else b""
+        if compressor:
+            yield compressor.compress(data) + compressor.flush()
+        elif data:
+            yield data
+
+    headers = {"Content-Encoding": "gzip"} if gzip else {}
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=headers)
+
+@router.get("/products/events", tags=["Products"])
+async def product_events():
+    """
+    Live product changes as Server-Sent Events ("insert", "update", "sold",
+    "delete"), each with the product id and, when known, the product. An
+    "evicted" event means the client fell behind and was disconnected; it
+    should reload the feed (EventSource reconnects by itself).
+    """
+    events = get_product_events()
+    try:
+        subscription = events.subscribe()
+    except TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    heartbeat = get_settings().EVENTS_HEARTBEAT_SECONDS
+
+    async def stream():
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                message = b": ping\n\n"  # comment line; keeps idle connections open
+            yield message
+            if message is EVICTED:
+                return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs however the stream ends, client disconnects included
+        background=BackgroundTask(events.unsubscribe, subscription),
+    )
 
 @router.get("/products/{id}", response_model=ProductResponse, tags=["Products"])
-async def view_product(id: str):
+async def view_product(id: str, request: Request):
     """
     View a single product by its ID.
     """
-    product = await Product.get(id)
-    if not product:
+    async def build() -> bytes:
+        doc = None
+        if ObjectId.is_valid(id):
+            doc = await Product.get_motor_collection().find_one({"_id": ObjectId(id)}, PRODUCT_PROJECTION)
+        if not doc:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        return dumps(product_to_api(doc))
+
+    return await product_cache.respond(request, build)
+
+def _revision_filter(revision: int) -> dict:
+    # Documents written before revisions existed have no field; treat them as revision 0
+    if revision == 0:
+        return {"revision": {"$in": [0, None]}}
+    return {"revision": revision}
+
+async def _update_product(id: str, changes: dict, expected_revision: Optional[int] = None) -> Product:
+    """
+    Apply `changes` with a single find_one_and_update and return the updated document.
+    With expected_revision, the write only happens if nobody else changed the
+    product in between; otherwise 409 Conflict is raised.
+    """
+    if not ObjectId.is_valid(id):
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    return ProductResponse.model_validate(product, from_attributes=True)
+
+    query = {"_id": ObjectId(id)}
+    if expected_revision is not None:
+        query.update(_revision_filter(expected_revision))
+
+    if not changes:
+        # Nothing to write: no new revision, cache invalidation or event
+        product = await Product.find_one(query)
+    else:
+        update = {"$set": changes, "$inc": {"revision": 1}}
+        product = await Product.find_one(query).update(update, response_type=UpdateResponse.NEW_DOCUMENT)
+    if product is None:
+        if expected_revision is not None and await Product.find({"_id": ObjectId(id)}).count():
+            raise HTTPException(status_code=409, detail="Product was modified by someone else; reload and retry")
+        raise HTTPException(status_code=404, detail="Product not found")
+    if not changes:
+        return product
+
+    await product_cache.invalidate()
+    event_type = "sold" if changes.get("is_sold") is True else "update"
+    publish_product_event(event_type, product.id, product_to_api(product.model_dump(by_alias=True)))
+    return product
 
 @router.put("/products/{id}", response_model=ProductResponse, tags=["Products"])
 async def edit_product(id: str, product_update: ProductUpdate):
     """
     Edit a product's details.
+    Send expected_revision to reject the edit (409) if the product changed since it was read.
     """
-    product = await Product.get(id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-
-    update_data = product_update.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(product, key, value)
+    update_data = product_update.model_dump(exclude_unset=True, exclude={"expected_revision"})
+    product = await _update_product(id, update_data, product_update.expected_revision)
 
-    await product.save()
-    
     return ProductResponse.model_validate(product, from_attributes=True)
 
 @router.delete("/products/{id}", status_code=204, tags=["Products"])
-async def delete_product(id: str):
+async def delete_product(id: str, background_tasks: BackgroundTasks):
     """
-    Delete a product.
+    Delete a product. Its images are released after the response is sent and
+    removed from storage once no other product uses them.
     """
-    product = await Product.get(id)
+    if not ObjectId.is_valid(id):
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    product = await Product.get(ObjectId(id))
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     await product.delete()
-    # You should also delete images from Cloudinary here
+    await product_cache.invalidate()
+    publish_product_event("delete", product.id)
+    if product.image_refs:
+        background_tasks.add_task(release_images, product.image_refs)
     return None
 
 @router.patch("/products/{id}/sold", response_model=ProductResponse, tags=["Products"])
@@ -176,11 +448,167 @@ async def mark_as_sold(id: str):
     """
     Mark a product as sold.
     """
-    product = await Product.get(id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
+    product = await _update_product(id, {"is_sold": True})
+
+    return ProductResponse.model_validate(product, from_attributes=True)
+
+def _parse_ids(ids: List[str]) -> Dict[str, Optional[ObjectId]]:
+    """Map each requested id to its ObjectId, or None when it is not a valid id"""
+    return {id: ObjectId(id) if ObjectId.is_valid(id) else None for id in ids}
+
+async def _existing_ids(object_ids: List[ObjectId]) -> Dict[ObjectId, int]:
+    """Return the current revision of each given id that exists, in a single query"""
+    cursor = Product.get_motor_collection().find({"_id": {"$in": object_ids}}, {"_id": 1, "revision": 1})
+    return {doc["_id"]: doc.get("revision", 0) async for doc in cursor}
+
+async def _owned_ids(object_ids: List[ObjectId], seller_id: str) -> Tuple[Dict[ObjectId, int], Set[ObjectId]]:
+    """
+    Split the given ids that exist into the seller's own (with their current
+    revision) and those listed by someone else, in a single query
+    """
+    cursor = Product.get_motor_collection().find(
+        {"_id": {"$in": object_ids}}, {"_id": 1, "revision": 1, "seller_id": 1}
+    )
+    owned, others = {}, set()
+    async for doc in cursor:
+        if doc.get("seller_id") == seller_id:
+            owned[doc["_id"]] = doc.get("revision", 0)
+        else:
+            others.add(doc["_id"])
+    return owned, others
+
+def _bulk_result(
+    parsed: Dict[str, Optional[ObjectId]],
+    existing: Dict[ObjectId, int],
+    ok_status: str,
+    conflicts: Optional[set] = None,
+    forbidden: Optional[set] = None,
+) -> BulkResult:
+    results = []
+    for id, oid in parsed.items():
+        if oid is None:
+            results.append(BulkItemResult(id=id, status="invalid_id"))
+        elif forbidden and oid in forbidden:
+            results.append(BulkItemResult(id=id, status="forbidden"))
+        elif conflicts and oid in conflicts:
+            results.append(BulkItemResult(id=id, status="conflict"))
+        elif oid in existing:
+            results.append(BulkItemResult(id=id, status=ok_status))
+        else:
+            results.append(BulkItemResult(id=id, status="not_found"))
+    succeeded = sum(1 for r in results if r.status == ok_status)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+@router.post("/products/bulk", response_model=BulkResult, tags=["Products"])
+async def bulk_create_products(payload: BulkProductCreate, user: User = Depends(get_current_user)):
+    """
+    Create many products (without images) for the current user in one insert_many.
+    """
+    products = [Product(**item.model_dump(), seller_id=str(user.id)) for item in payload.items]
+    inserted = await Product.insert_many(products)
+    await product_cache.invalidate()
+    for product, oid in zip(products, inserted.inserted_ids):
+        product.id = oid
+    publish_product_events(
+        [("insert", product.id, product_to_api(product.model_dump(by_alias=True))) for product in products]
+    )
+
+    results = [BulkItemResult(id=str(oid), status="created") for oid in inserted.inserted_ids]
+    return BulkResult(succeeded=len(results), failed=0, results=results)
+
+@router.patch("/products/bulk", response_model=BulkResult, tags=["Products"])
+async def bulk_update_products(payload: BulkProductUpdate, user: User = Depends(get_current_user)):
+    """
+    Apply a patch to each of the current user's listed products in one bulk
+    write. Each id may be listed once; other sellers' products are reported
+    as forbidden.
+    """
+    seen = set()
+    for item in payload.items:
+        if item.id in seen:
+            raise HTTPException(status_code=400, detail=f"Product {item.id} is listed more than once")
+        seen.add(item.id)
+
+    seller_id = str(user.id)
+    parsed = _parse_ids([item.id for item in payload.items])
+    existing, forbidden = await _owned_ids([oid for oid in parsed.values() if oid is not None], seller_id)
+
+    operations = []
+    updates: List[Tuple[ObjectId, dict]] = []  # (id, changes) of each operation
+    conflicts = set()
+    for item in payload.items:
+        oid = parsed[item.id]
+        if oid not in existing:
+            continue
+        expected = item.changes.expected_revision
+        if expected is not None and existing[oid] != expected:
+            conflicts.add(oid)
+            continue
+        changes = item.changes.model_dump(exclude_unset=True, exclude={"expected_revision"})
+        if changes:
+            # The revision stays in the filter so a concurrent edit between the
+            # lookup above and this write is not overwritten.
+            query = {"_id": oid, "seller_id": seller_id, **_revision_filter(existing[oid])}
+            operations.append(UpdateOne(query, {"$set": changes, "$inc": {"revision": 1}}))
+            updates.append((oid, changes))
+    if operations:
+        result = await Product.get_motor_collection().bulk_write(operations, ordered=False)
+        await product_cache.invalidate()
+        if result.matched_count < len(operations):
+            # Some product changed under us; find out which so they report a conflict
+            attempted = [oid for oid, _ in updates]
+            current = await _existing_ids(attempted)
+            conflicts.update(oid for oid in attempted if current.get(oid) != existing[oid] + 1)
+        # Subscribers fetch the changed products themselves
+        publish_product_events([
+            ("sold" if changes.get("is_sold") is True else "update", oid, None)
+            for oid, changes in updates
+            if oid not in conflicts
+        ])
+
+    return _bulk_result(parsed, existing, "updated", conflicts, forbidden)
+
+@router.post("/products/bulk/sold", response_model=BulkResult, tags=["Products"])
+async def bulk_mark_as_sold(payload: BulkProductIds, user: User = Depends(get_current_user)):
+    """
+    Mark many of the current user's products as sold with a single update.
+    """
+    seller_id = str(user.id)
+    parsed = _parse_ids(payload.ids)
+    existing, forbidden = await _owned_ids([oid for oid in parsed.values() if oid is not None], seller_id)
+    if existing:
+        await Product.get_motor_collection().update_many(
+            {"_id": {"$in": list(existing)}, "seller_id": seller_id},
+            {"$set": {"is_sold": True}, "$inc": {"revision": 1}},
+        )
+        await product_cache.invalidate()
+        publish_product_events([("sold", oid, None) for oid in existing])
+
+    return _bulk_result(parsed, existing, "updated", forbidden=forbidden)
+
+@router.post("/products/bulk/delete", response_model=BulkResult, tags=["Products"])
+async def bulk_delete_products(
+    payload: BulkProductIds, background_tasks: BackgroundTasks, user: User = Depends(get_current_user)
+):
+    """
+    Delete many of the current user's products with a single delete; their
+    images are released in the background.
+    """
+    seller_id = str(user.id)
+    parsed = _parse_ids(payload.ids)
+    existing, forbidden = await _owned_ids([oid for oid in parsed.values() if oid is not None], seller_id)
+    if existing:
+        collection = Product.get_motor_collection()
+        query = {"_id": {"$in": list(existing)}, "seller_id": seller_id}
+        image_refs = [
+            ref
+            async for doc in collection.find(query, {"image_refs": 1})
+            for ref in doc.get("image_refs", [])
+        ]
+        await collection.delete_many(query)
+        await product_cache.invalidate()
+        publish_product_events([("delete", oid, None) for oid in existing])
+        if image_refs:
+            background_tasks.add_task(release_images, image_refs)
 
-    product.is_sold = True
-    await product.save()
-    
-    return ProductResponse.model_validate(product, from_attributes=True)
\ No newline at end of file
+    return _bulk_result(parsed, existing, "deleted", forbidden=forbidden)
@@ -0,0 +1,73 @@
+# app/api/endpoints/users.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Optional
+
+from app.models.product import Product
+from app.models.user import User
+from app.schema.product import SellerListingsPage, SellerStats
+from app.core.deps import get_current_user
+from app.core.pagination import InvalidCursor, encode_cursor, keyset_after
+from app.core.serialization import FastJSONResponse, PRODUCT_PROJECTION, dumps, product_to_api
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+async def seller_stats(seller_id: str) -> SellerStats:
+    """
+    Count a seller's active and sold listings and sum their prices in one
+    aggregation; the $match is served by the "seller" index.
+    """
+    pipeline = [
+        {"$match": {"seller_id": seller_id}},
+        {"$group": {"_id": "$is_sold", "count": {"$sum": 1}, "value": {"$sum": "$price"}}},
+    ]
+    groups = {
+        bool(group["_id"]): group
+        async for group in Product.get_motor_collection().aggregate(pipeline)
+    }
+    active = groups.get(False, {})
+    sold = groups.get(True, {})
+    return SellerStats(
+        active=active.get("count", 0),
+        sold=sold.get("count", 0),
+        total=active.get("count", 0) + sold.get("count", 0),
+        active_value=active.get("value", 0.0),
+        sold_value=sold.get("value", 0.0),
+    )
+
+@router.get("/me/products", response_model=SellerListingsPage)
+async def my_listings(
+    cursor: Optional[str] = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    is_sold: Optional[bool] = None,
+    user: User = Depends(get_current_user),
+):
+    """
+    Get a page of the current user's own listings, newest first, with their
+    active/sold counts and values on the first page.
+    """
+    seller_id = str(user.id)
+    # Like the feed: an explicit $in keeps the sort on the (seller_id, is_sold,
+    # date_added, _id) index when the caller does not filter on is_sold
+    query = {"seller_id": seller_id, "is_sold": {"$in": [False, True]} if is_sold is None else is_sold}
+    if cursor:
+        try:
+            query.update(keyset_after(cursor))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    docs = await (
+        Product.get_motor_collection()
+        .find(query, PRODUCT_PROJECTION)
+        .sort([("date_added", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["date_added"], docs[-1]["_id"])
+
+    stats = None if cursor else (await seller_stats(seller_id)).model_dump()
+    # Per-user data, so it bypasses the shared product response cache
+    page = {"items": [product_to_api(doc) for doc in docs], "next_cursor": next_cursor, "stats": stats}
+    return Response(content=dumps(page), media_type="application/json")
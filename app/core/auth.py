@@ -1,17 +1,30 @@
-import httpx
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt # for encoding/decoding jwt token
-from app.core.config import settings
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.core.config import get_settings
 from app.models.user import User
+from app.core.user_cache import invalidate_user
+from app.core.http_client import get_http_client
+from app.core.jwks import JWKSCache, JWKSUnavailable
 
 # Google OAuth endpoints
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+# Google's ID-token signing keys, refreshed in the background once loaded
+google_jwks = JWKSCache(GOOGLE_JWKS_URL)
+
+class InvalidIdToken(ValueError):
+    """Raised when a Google id_token fails verification"""
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
+    from jose import jwt # for encoding/decoding jwt token; imported on first use
+    settings = get_settings()
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -24,6 +37,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify and decode a JWT token"""
+    from jose import JWTError, jwt
+    settings = get_settings()
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
@@ -32,49 +47,121 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
 
 async def get_google_user_info(access_token: str) -> Optional[Dict[str, Any]]:
     """Get user information from Google using access token"""
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": f"Bearer {access_token}"}
-        response = await client.get(GOOGLE_USERINFO_URL, headers=headers)
-        
-        if response.status_code == 200:
-            return response.json()
-        return None
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await get_http_client().get(GOOGLE_USERINFO_URL, headers=headers)
+
+    if response.status_code == 200:
+        return response.json()
+    return None
+
+async def verify_google_id_token(id_token: str, access_token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verify a Google id_token locally (signature against the cached JWKS,
+    audience, issuer, expiry and, when given, the access token's at_hash) and
+    return its user info in the shape of the userinfo endpoint.
+    """
+    from jose import JWTError, jwt
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except JWTError as e:
+        raise InvalidIdToken(f"Malformed id_token: {e}") from e
+    key = await google_jwks.get_key(header.get("kid"))
+    if key is None:
+        raise InvalidIdToken("id_token is signed with an unknown key")
+
+    try:
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=get_settings().GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            access_token=access_token,
+        )
+    except JWTError as e:
+        raise InvalidIdToken(f"Invalid id_token: {e}") from e
+    if not claims.get("email_verified"):
+        raise InvalidIdToken("Google account email is not verified")
+
+    return {
+        "id": claims["sub"],
+        "email": claims.get("email"),
+        "verified_email": True,
+        "name": claims.get("name", ""),
+        "picture": claims.get("picture"),
+    }
+
+async def get_google_user(token_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    User info for a token response: read from its id_token without another
+    request to Google, or from the userinfo endpoint when there is no id_token
+    or Google's keys cannot be fetched.
+    """
+    id_token = token_data.get("id_token")
+    if id_token:
+        try:
+            return await verify_google_id_token(id_token, token_data.get("access_token"))
+        except JWKSUnavailable as e:
+            print(f"{e}; falling back to the userinfo endpoint")
+    return await get_google_user_info(token_data["access_token"])
+
+async def shutdown_google_auth():
+    """
+    Stop refreshing Google's signing keys.
+    """
+    await google_jwks.stop()
 
 async def authenticate_google_user(google_user_info: Dict[str, Any]) -> User:
-    """Authenticate or create a user from Google OAuth data"""
+    """
+    Authenticate or create a user from Google OAuth data with a single
+    find_one_and_update upsert; the unique email index makes concurrent
+    first logins end up with one user.
+    """
     email = google_user_info.get("email")
     oauth_id = google_user_info.get("id")
     
     if not email or not oauth_id:
         raise ValueError("Invalid Google user info")
     
-    # Check if user already exists
-    user = await User.find_one({"email": email})
-    
-    if user:
-        # Update OAuth ID if not set
-        if not user.oauth_id:
-            user.oauth_id = oauth_id
-            await user.save()
-        return user
-    
-    # Create new user
-    user_data = {
-        "email": email,
-        "name": google_user_info.get("name", ""),
-        "profile_picture": google_user_info.get("picture"),
-        "oauth_provider": "google",
-        "oauth_id": oauth_id,
-        "is_verified": True,  # Google accounts are pre-verified
-        "is_active": True
-    }
-    
-    user = User(**user_data)
-    await user.insert()
+    # Only written when the user is created
+    new_user = User(
+        email=email,
+        name=google_user_info.get("name", ""),
+        profile_picture=google_user_info.get("picture"),
+        oauth_provider="google",
+        oauth_id=oauth_id,
+        is_verified=True,  # Google accounts are pre-verified
+        is_active=True,
+    )
+    on_insert = new_user.model_dump(by_alias=True, exclude={"id", "email", "last_login_at"})
+
+    collection = User.get_motor_collection()
+    for attempt in range(2):
+        try:
+            doc = await collection.find_one_and_update(
+                {"email": new_user.email},
+                {"$setOnInsert": on_insert, "$set": {"last_login_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            break
+        except DuplicateKeyError:
+            # A concurrent first login inserted the user between our match and
+            # insert; the retry matches it. A second failure is a real conflict
+            # (this Google account is already linked to another email).
+            if attempt:
+                raise ValueError("This Google account is already linked to another user")
+    user = User.model_validate(doc)
+    invalidate_user(user.id)
+
+    # Users created before OAuth ids were stored get theirs on first login
+    if not user.oauth_id:
+        await user.update_fields(oauth_id=oauth_id)
     return user
 
 def get_google_auth_url() -> str:
     """Generate Google OAuth authorization URL"""
+    settings = get_settings()
     params = {
         "client_id": settings.GOOGLE_CLIENT_ID,
         "redirect_uri": settings.GOOGLE_REDIRECT_URI,
@@ -89,17 +176,17 @@ def get_google_auth_url() -> str:
 
 async def exchange_code_for_token(code: str) -> Optional[Dict[str, Any]]:
     """Exchange authorization code for access token"""
-    async with httpx.AsyncClient() as client:
-        data = {
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "code": code,
-            "grant_type": "authorization_code",
-            "redirect_uri": settings.GOOGLE_REDIRECT_URI
-        }
-        
-        response = await client.post(GOOGLE_TOKEN_URL, data=data)
-        
-        if response.status_code == 200:
-            return response.json()
-        return None
+    settings = get_settings()
+    data = {
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
+        "code": code,
+        "grant_type": "authorization_code",
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI
+    }
+
+    response = await get_http_client().post(GOOGLE_TOKEN_URL, data=data)
+
+    if response.status_code == 200:
+        return response.json()
+    return None
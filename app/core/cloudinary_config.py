@@ -1,15 +1,27 @@
 # app/core/cloudinary_config.py
-import cloudinary
-from app.core.config import settings
+import threading
+from app.core.config import get_settings
+
+_initialized = False
+_lock = threading.Lock()  # upload threads may race to initialize
 
 def init_cloudinary():
     """
     Initialize Cloudinary configuration using settings from config.
+    Safe to call more than once; only the first call configures the SDK.
     """
-    cloudinary.config(
-        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-        api_key=settings.CLOUDINARY_API_KEY,
-        api_secret=settings.CLOUDINARY_API_SECRET,
-        secure=True
-    )
+    global _initialized
+    with _lock:
+        if _initialized:
+            return
+        import cloudinary
+
+        settings = get_settings()
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET,
+            secure=True
+        )
+        _initialized = True
     print("Cloudinary configuration initialized...") 
\ No newline at end of file
@@ -0,0 +1,260 @@
+# app/core/compression.py
+# Content-Encoding negotiation and response compression. gzip comes with
+# Python; brotli (`brotli` or `brotlicffi`) and zstd (`zstandard`) are in
+# requirements.txt, imported on first use and skipped if they are missing.
+import gzip
+import importlib
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import get_settings
+
+# Media types worth compressing; images are already compressed
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript",
+                      "application/xml", "image/svg+xml")
+
+
+class Encoder(ABC):
+    """One content coding: one-shot compress() plus stream() for chunked bodies"""
+
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def stream(self) -> "StreamEncoder":
+        ...
+
+
+class StreamEncoder:
+    """
+    Incremental compressor. Every chunk is flushed so the client can decode
+    it right away, which keeps streamed responses (NDJSON export) streaming.
+    """
+
+    def __init__(self, compress, flush, finish):
+        self._compress = compress
+        self._flush = flush
+        self._finish = finish
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compress(data) + self._flush()
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class GzipEncoder(Encoder):
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self) -> StreamEncoder:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+        return StreamEncoder(compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+class BrotliEncoder(Encoder):
+    name = "br"
+
+    def __init__(self, module, quality: int):
+        self._brotli = module
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> StreamEncoder:
+        compressor = self._brotli.Compressor(quality=self.quality)
+        return StreamEncoder(compressor.process, compressor.flush, compressor.finish)
+
+
+class ZstdEncoder(Encoder):
+    name = "zstd"
+
+    def __init__(self, module, level: int):
+        self._zstd = module
+        self._compressor = module.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> StreamEncoder:
+        compressor = self._compressor.compressobj()
+        return StreamEncoder(
+            compressor.compress, lambda: compressor.flush(self._zstd.COMPRESSOBJ_FLUSH_BLOCK), compressor.flush
+        )
+
+
+def _import_first(*names):
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def _make_encoder(name: str) -> Optional[Encoder]:
+    settings = get_settings()
+    if name == "gzip":
+        return GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)
+    if name == "br":
+        module = _import_first("brotli", "brotlicffi")
+        return BrotliEncoder(module, settings.COMPRESSION_BROTLI_QUALITY) if module else None
+    if name == "zstd":
+        module = _import_first("zstandard")
+        return ZstdEncoder(module, settings.COMPRESSION_ZSTD_LEVEL) if module else None
+    raise ValueError(f"Unknown compression encoding: {name}")
+
+
+_encoders: Optional[List[Encoder]] = None
+
+
+def get_encoders() -> List[Encoder]:
+    """Usable encoders from COMPRESSION_ENCODINGS, in order of server preference"""
+    global _encoders
+    if _encoders is None:
+        encoders = []
+        for name in filter(None, (n.strip() for n in get_settings().COMPRESSION_ENCODINGS.split(","))):
+            encoder = _make_encoder(name)
+            if encoder is None:
+                print(f"Response compression: {name} is not installed, skipping it")
+            else:
+                encoders.append(encoder)
+        _encoders = encoders
+    return _encoders
+
+
+@lru_cache(maxsize=256)
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    best, best_weight = None, 0.0
+    for encoder in get_encoders():
+        weight = weights.get(encoder.name, weights.get("*", 0.0))
+        if weight > best_weight:  # ties keep the server's preference
+            best, best_weight = encoder.name, weight
+    return best
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[Encoder]:
+    """Pick the encoder for an Accept-Encoding header, or None to send identity"""
+    if not accept_encoding:
+        return None
+    name = _negotiate(accept_encoding)
+    return next((encoder for encoder in get_encoders() if encoder.name == name), None)
+
+
+def is_compressible(media_type: str) -> bool:
+    media_type = media_type.lower()
+    # Event streams stay uncompressed so proxies and EventSource see every event at once
+    return media_type.startswith(COMPRESSIBLE_TYPES) and not media_type.startswith("text/event-stream")
+
+
+def mark_encoded(headers: MutableHeaders, encoding: str):
+    """Set the headers of a response whose body is now `encoding`-compressed"""
+    headers["Content-Encoding"] = encoding
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        # The bytes differ from the identity body, so the strong validator no longer applies
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with the best encoding the
+    client accepts. Complete bodies under COMPRESSION_MIN_SIZE are left
+    alone; streamed bodies are compressed chunk by chunk. Responses that
+    already carry a Content-Encoding (e.g. precompressed cached bodies) pass
+    through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoder = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        threshold = get_settings().COMPRESSION_MIN_SIZE
+        start = None
+        mode = None  # "identity", "stream", or None until the first body message decides
+        stream = None
+
+        async def send_compressed(message):
+            nonlocal start, mode, stream
+            if message["type"] == "http.response.start":
+                start = message
+                if not self._should_compress(message):
+                    mode = "identity"
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or mode == "identity":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if mode is None:
+                headers = MutableHeaders(scope=start)
+                if not more_body:
+                    # Complete body in one message: compress it whole if it is worth it
+                    mode = "identity"
+                    if len(body) >= threshold:
+                        body = encoder.compress(body)
+                        mark_encoded(headers, encoder.name)
+                        headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                mode = "stream"
+                stream = encoder.stream()
+                mark_encoded(headers, encoder.name)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start)
+
+            data = stream.chunk(body) if body else b""
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _should_compress(start) -> bool:
+        status = start["status"]
+        if status < 200 or status in (204, 304):
+            return False
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        return is_compressible(headers.get("content-type", ""))
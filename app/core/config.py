@@ -1,34 +1,122 @@
 # app/core/config.py
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
+    # Server Configuration (see run.py)
+    SERVER_MODE: str = "dev"  # "dev" (single process, auto-reload) or "prod" (multi-worker)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8002
+    SERVER_WORKERS: int = 0  # 0 = one worker per CPU
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+
     # Database Configuration - Use local MongoDB for development
     DATABASE_URL: str = "mongodb://localhost:27017/student_store"
+    MONGO_MAX_POOL_SIZE: int = 100  # per worker process
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10000  # fail a request that waits this long for a connection
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_READ_PREFERENCE: str = "primary"
     
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME: str = ""
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
+
+    # Image Processing Configuration
+    IMAGE_WORKERS: int = 2  # processes in the compression pool
+    IMAGE_QUEUE_SIZE: int = 16  # images queued or in flight before uploads get 503
+    IMAGE_RETRY_AFTER_SECONDS: int = 5
+    IMAGE_MAX_LONG_SIDE: int = 1600  # stored images are downscaled to this long side
+    IMAGE_WEBP: bool = True  # also store WebP renditions when smaller than the JPEG
+    IMAGE_MAX_PIXELS: int = 50_000_000  # larger images are rejected from their header, before decoding
+    # "sync": add_product waits for processing; "async": it returns at once and a background job fills the images in
+    IMAGE_PROCESSING_MODE: str = "sync"
+    IMAGE_DEDUP_PERCEPTUAL: bool = False  # also reuse stored images whose perceptual hash is nearly identical
+
+    # Background image jobs (IMAGE_PROCESSING_MODE=async)
+    JOB_CONCURRENCY: int = 2  # jobs run at once per worker
+    JOB_POLL_INTERVAL_SECONDS: float = 2  # how often to look for jobs queued by other workers
+    JOB_LEASE_SECONDS: int = 300  # a running job is re-claimed if its worker has not finished by then
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5  # delay before the first retry, doubling each time
+    JOB_DRAIN_IN_SYNC_MODE: bool = False  # run the job runner in sync mode too, to finish jobs left from async mode
+
+    # Live product events (GET /api/v1/products/events)
+    # "auto": follow a MongoDB change stream when the server supports it (replica set),
+    # otherwise deliver this worker's own writes; "local": always the latter
+    EVENTS_SOURCE: str = "auto"
+    EVENTS_QUEUE_SIZE: int = 100  # undelivered events per client before it is disconnected
+    EVENTS_MAX_SUBSCRIBERS: int = 1000  # open event streams per worker
+    EVENTS_HEARTBEAT_SECONDS: float = 15  # comment line sent on idle streams to keep proxies from closing them
+
+    # Image Storage Configuration
+    IMAGE_STORAGE_BACKEND: str = "cloudinary"  # "cloudinary" or "local"
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_URL: str = "http://localhost:8002/media"
+    UPLOAD_CONCURRENCY: int = 8  # uploads in flight per worker
+    UPLOAD_TIMEOUT_SECONDS: float = 30
+    UPLOAD_RETRIES: int = 2
+    UPLOAD_MAX_FILE_BYTES: int = 15 * 1024 * 1024  # per uploaded image
+    UPLOAD_MAX_REQUEST_BYTES: int = 50 * 1024 * 1024  # whole multipart body
+    UPLOAD_MAX_FILES: int = 10  # images per product
     
     # Google OAuth Configuration
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_REDIRECT_URI: str = "http://localhost:8002/api/v1/auth/google/callback"
+
+    # Outbound HTTP client (Google OAuth and JWKS), shared per worker
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_SECONDS: float = 60
+    HTTP_CLIENT_HTTP2: bool = True  # needs `h2` (httpx[http2] in requirements.txt); HTTP/1.1 without it
     
     # JWT Configuration
     JWT_SECRET_KEY: str = "your-secret-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Product response cache; set RESPONSE_CACHE_URL (redis://...) to share it across workers
+    RESPONSE_CACHE_TTL_SECONDS: float = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_URL: str = ""
+
+    # Response compression; br needs the `brotli` package, zstd needs `zstandard` (both in requirements.txt)
+    COMPRESSION_ENCODINGS: str = "br,zstd,gzip"  # preference order when the client accepts several
+    COMPRESSION_MIN_SIZE: int = 1024  # complete bodies smaller than this (bytes) are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Authenticated-user cache (per worker)
+    USER_CACHE_TTL_SECONDS: float = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+
     class Config:
         env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Build the Settings on first use (reads the environment and .env) and cache them"""
+    return Settings()
+
+def __getattr__(name):
+    # `from app.core.config import settings` keeps working, but the Settings
+    # object is only built when it is first asked for, not when this module is imported.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Validate required settings
 def validate_settings():
     """Validate that required settings are configured"""
+    settings = get_settings()
     if not settings.GOOGLE_CLIENT_ID:
         print("⚠️  WARNING: GOOGLE_CLIENT_ID is not set. Google OAuth will not work.")
         print("   Please create a .env file with your Google OAuth credentials.")
@@ -41,6 +129,3 @@ def validate_settings():
     
     print(f"📊 Database URL: {settings.DATABASE_URL}")
     print(f"🔐 Google OAuth: {'✅ Configured' if settings.GOOGLE_CLIENT_ID else '❌ Not configured'}")
-
-# Call validation on import
-validate_settings()
\ No newline at end of file
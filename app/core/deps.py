@@ -1,17 +1,26 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.auth import verify_token
+from app.core.user_cache import get_token_cache, get_user_cache
 from app.models.user import User
 
 security = HTTPBearer()
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """
-    Dependency to get the current authenticated user
+    Dependency to get the current authenticated user.
+    Decoded tokens and user documents are served from short-lived
+    in-process caches, so most requests skip the MongoDB lookup.
     """
     try:
         token = credentials.credentials
-        payload = verify_token(token)
+        token_cache = get_token_cache()
+        payload = token_cache.get(token)
+        if payload is None:
+            payload = verify_token(token)
+            if payload:
+                token_cache.set(token, payload, ttl=payload.get("exp", 0) - time.time())
         
         if not payload:
             raise HTTPException(
@@ -28,12 +37,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        user = await User.get(user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        user_cache = get_user_cache()
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await User.get(user_id)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
+            user_cache.set(user_id, user)
         
         if not user.is_active:
             raise HTTPException(
@@ -41,7 +54,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
                 detail="Inactive user"
             )
         
-        return user
+        # Hand out a copy so request handlers cannot mutate the cached snapshot
+        return user.model_copy()
         
     except HTTPException:
         raise
@@ -0,0 +1,246 @@
+# app/core/events.py
+# Live product events for GET /products/events (Server-Sent Events). Each
+# worker runs one MongoDB change stream on the products collection and fans
+# its events out to every connected client through a bounded queue per
+# client; a client that falls behind is disconnected instead of buffering
+# without limit (EventSource reconnects and the page re-fetches the feed).
+# Without change streams (standalone mongod) the write endpoints publish
+# their own events, which then only reach clients of the same worker.
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import get_settings
+from app.core.metrics import registry
+from app.core.serialization import dumps, product_to_api
+from app.models.product import Product
+
+PRODUCT_EVENTS = registry.counter("product_events_total", "Product events fanned out to subscribers", ("type",))
+EVICTED_SUBSCRIBERS = registry.counter(
+    "product_event_subscribers_evicted_total", "Event stream clients disconnected for falling behind"
+)
+
+CHANGE_STREAM_UNSUPPORTED = 40573  # "$changeStream is only supported on replica sets"
+RETRY_MAX_SECONDS = 30
+# (type, product id, API representation of the product or None)
+Event = Tuple[str, Any, Optional[Dict[str, Any]]]
+# Sent to a client right before it is disconnected for falling behind
+EVICTED = b"event: evicted\ndata: {}\n\n"
+
+
+class TooManySubscribers(Exception):
+    """Raised when this worker already serves EVENTS_MAX_SUBSCRIBERS streams"""
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+
+def _sse(event_type: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event_type.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class ProductEventBroker:
+    """
+    Fans product events out to subscribers. `source` is "change_stream" while
+    the change stream is running; otherwise ("local") events published by
+    this worker's write endpoints are delivered instead.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int, use_change_stream: bool):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.use_change_stream = use_change_stream
+        self.source = "local"
+        self._subscribers: Set[Subscription] = set()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def start(self):
+        if self.use_change_stream and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+            self._watch_task.add_done_callback(self._watch_stopped)
+
+    async def stop(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+        for subscription in list(self._subscribers):
+            self._evict(subscription, count=False)
+
+    def subscribe(self) -> Subscription:
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers("Too many live event streams on this server; try again later")
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish_local(self, events: List[Event]):
+        """Deliver events from a write endpoint, unless the change stream already reports them"""
+        if self.source != "change_stream":
+            self._dispatch(events)
+
+    def _dispatch(self, events: List[Event]):
+        # Rendered once and shared by every subscriber; a batch (bulk write)
+        # takes a single queue slot so it cannot overflow a queue by itself
+        message = b"".join(
+            _sse(event_type, {"id": str(product_id), "product": product}) for event_type, product_id, product in events
+        )
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._evict(subscription)
+        for event_type, _, _ in events:
+            PRODUCT_EVENTS.inc(type=event_type)
+
+    def _evict(self, subscription: Subscription, count: bool = True):
+        """Drop a subscriber: its backlog is discarded and replaced by EVICTED"""
+        self._subscribers.discard(subscription)
+        subscription.evicted = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(EVICTED)
+        if count:
+            EVICTED_SUBSCRIBERS.inc()
+
+    @staticmethod
+    async def _supports_change_streams(collection) -> bool:
+        """Change streams need a replica set or a sharded cluster (mongos)"""
+        try:
+            hello = await collection.database.client.admin.command("hello")
+        except NotImplementedError:
+            return False  # in-memory stand-ins (mongomock) implement neither hello nor watch()
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    def _change_streams_unavailable(self):
+        self.source = "local"
+        print("Product events: change streams unavailable (needs a replica set), "
+              "publishing this worker's own writes instead")
+
+    async def _watch(self):
+        collection = Product.get_motor_collection()
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        resume_token = None
+        supported = None  # checked once, as soon as the server answers
+        delay = 1
+        while True:
+            try:
+                if supported is None:
+                    supported = await self._supports_change_streams(collection)
+                    if not supported:
+                        self._change_streams_unavailable()
+                        return
+                async with collection.watch(
+                    pipeline, full_document="updateLookup", resume_after=resume_token
+                ) as stream:
+                    while True:
+                        change = await stream.try_next()  # returns None after the server's await time
+                        if self.source != "change_stream":
+                            self.source = "change_stream"
+                            delay = 1
+                            print("Product events: following the MongoDB change stream...")
+                        resume_token = stream.resume_token
+                        if change is not None:
+                            self._dispatch([self._from_change(change)])
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED:
+                    self._change_streams_unavailable()
+                    return
+                resume_token = None  # e.g. the token is no longer in the oplog: start over from now
+                self._stream_failed(e, delay)
+            except PyMongoError as e:
+                self._stream_failed(e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def _watch_stopped(self, task: asyncio.Task):
+        # Whatever ended the watch (a bug included), fall back to local events
+        self.source = "local"
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Product change stream stopped by an unexpected error: {task.exception()!r}")
+
+    def _stream_failed(self, error: Exception, delay: float):
+        # Local events cover this worker's writes until the stream is back
+        self.source = "local"
+        print(f"Product change stream failed, retrying in {delay}s: {error}")
+
+    @staticmethod
+    def _from_change(change: Dict[str, Any]) -> Event:
+        product_id = change["documentKey"]["_id"]
+        operation = change["operationType"]
+        if operation == "delete":
+            return "delete", product_id, None
+        document = change.get("fullDocument")
+        product = product_to_api(document) if document else None
+        if operation == "insert":
+            return "insert", product_id, product
+        updated = change.get("updateDescription", {}).get("updatedFields", {})
+        return ("sold" if updated.get("is_sold") is True else "update"), product_id, product
+
+
+_broker: Optional[ProductEventBroker] = None
+
+
+def get_product_events() -> ProductEventBroker:
+    """Return this worker's event broker (init_product_events must have run)"""
+    if _broker is None:
+        raise RuntimeError("Product events are not initialized; call init_product_events() first")
+    return _broker
+
+
+def subscriber_count() -> int:
+    """Open event streams in this worker"""
+    return _broker.subscriber_count if _broker is not None else 0
+
+
+def publish_product_event(event_type: str, product_id: Any, product: Optional[Dict[str, Any]] = None):
+    """
+    Report a product write ("insert", "update", "sold" or "delete"). `product`
+    is the API representation, or None when clients should fetch it themselves.
+    """
+    publish_product_events([(event_type, product_id, product)])
+
+
+def publish_product_events(events: List[Event]):
+    """Report the writes of one bulk operation together"""
+    if _broker is not None and events:
+        _broker.publish_local(events)
+
+
+def init_product_events():
+    """
+    Start following product changes in this worker.
+    """
+    global _broker
+    if _broker is None:
+        settings = get_settings()
+        _broker = ProductEventBroker(
+            queue_size=settings.EVENTS_QUEUE_SIZE,
+            max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+            use_change_stream=settings.EVENTS_SOURCE == "auto",
+        )
+        _broker.start()
+        print("Product events initialized...")
+
+
+async def shutdown_product_events():
+    """
+    Stop the change stream and disconnect event stream clients.
+    """
+    global _broker
+    if _broker is not None:
+        await _broker.stop()
+        _broker = None
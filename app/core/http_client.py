@@ -0,0 +1,53 @@
+# app/core/http_client.py
+# One pooled httpx.AsyncClient per worker for outbound calls (Google OAuth,
+# JWKS). Connections are kept alive between requests and use HTTP/2 (`h2`,
+# installed with httpx[http2]), so logins skip the TCP+TLS handshake.
+import importlib.util
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import get_settings
+
+if TYPE_CHECKING:
+    import httpx
+
+_client: Optional["httpx.AsyncClient"] = None
+_transport: Optional["httpx.AsyncBaseTransport"] = None
+
+
+def set_http_transport(transport: Optional["httpx.AsyncBaseTransport"]):
+    """
+    Route outbound requests through `transport` (e.g. httpx.MockTransport to
+    run offline). Takes effect for the next client created, so call it before
+    startup or after shutdown_http_client().
+    """
+    global _transport
+    _transport = transport
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Return the shared HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        import httpx  # imported on first use to keep app startup light
+
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            http2=settings.HTTP_CLIENT_HTTP2 and importlib.util.find_spec("h2") is not None,
+            timeout=settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_SECONDS,
+            ),
+            transport=_transport,
+        )
+    return _client
+
+
+async def shutdown_http_client():
+    """
+    Close the shared HTTP client and its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
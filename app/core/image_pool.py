@@ -0,0 +1,154 @@
+# app/core/image_pool.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.core.images import CompressionResult, VariantSet, build_variants, compress_image_with_stats, perceptual_hash
+from app.core.metrics import IMAGE_COMPRESS_SECONDS, timed_phase
+
+
+class ImagePipelineBusy(Exception):
+    """Raised when the image pipeline has no room for more work"""
+
+
+class ImageWorkerCrashed(ImagePipelineBusy):
+    """Raised when a batch breaks the process pool even after a restart"""
+
+
+class ImagePool:
+    """
+    Runs CPU-bound image work in a process pool so it never blocks the event loop.
+
+    Admission control: at most `max_pending` images may be queued or running
+    at once. A batch that does not fit is rejected as a whole with
+    ImagePipelineBusy instead of waiting. If a worker dies the pool is
+    restarted and the batch retried once.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        max_long_side: int = 1600,
+        webp: bool = True,
+        max_pixels: Optional[int] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_long_side = max_long_side
+        self.webp = webp
+        self.max_pixels = max_pixels
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self):
+        if self._executor is None:
+            # spawn keeps workers independent of the parent's threads (Motor, uvloop)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _replace_broken(self, executor: ProcessPoolExecutor):
+        # A worker died (out of memory, decoder crash), which breaks the whole
+        # executor; concurrent batches see the same failure, so replace it once
+        if self._executor is executor:
+            print("Image process pool broken (a worker died), restarting it...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.start()
+
+    async def _map(self, fn, payloads: List[bytes], *args) -> list:
+        """Run fn(payload, *args) for every payload in the pool, preserving input order"""
+        count = len(payloads)
+        if self._pending + count > self.max_pending:
+            raise ImagePipelineBusy(
+                f"Image pipeline is full ({self._pending}/{self.max_pending} pending)"
+            )
+
+        self.start()
+        self._pending += count
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self._executor
+                futures = [loop.run_in_executor(executor, fn, data, *args) for data in payloads]
+                try:
+                    with timed_phase("compress"):
+                        return await asyncio.gather(*futures)
+                except BrokenProcessPool:
+                    self._replace_broken(executor)
+            # Broke twice: likely this batch itself kills the worker
+            raise ImageWorkerCrashed("Image workers crashed while processing this batch")
+        finally:
+            self._pending -= count
+
+    @staticmethod
+    def _observe(results):
+        for result in results:
+            IMAGE_COMPRESS_SECONDS.observe(result.elapsed_ms / 1000)
+        return results
+
+    async def compress_many(self, payloads: List[bytes], max_size_kb: int = 200) -> List[CompressionResult]:
+        """Compress several images concurrently to a single JPEG each"""
+        return self._observe(await self._map(
+            compress_image_with_stats, payloads, max_size_kb, self.max_long_side, self.max_pixels
+        ))
+
+    async def variants_many(self, payloads: List[bytes], max_size_kb: int = 200) -> List[VariantSet]:
+        """Build the full/medium/thumb renditions of several images concurrently"""
+        return self._observe(await self._map(
+            build_variants, payloads, max_size_kb, self.max_long_side, self.webp, self.max_pixels
+        ))
+
+    async def perceptual_hashes(self, payloads: List[bytes]) -> List[str]:
+        """dHash of several images, decoded at reduced scale"""
+        return await self._map(perceptual_hash, payloads)
+
+
+_pool: Optional[ImagePool] = None
+
+
+def get_image_pool() -> ImagePool:
+    """Return the per-worker image pool, creating it from settings on first use"""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = ImagePool(
+            max_workers=settings.IMAGE_WORKERS,
+            max_pending=settings.IMAGE_QUEUE_SIZE,
+            max_long_side=settings.IMAGE_MAX_LONG_SIDE,
+            webp=settings.IMAGE_WEBP,
+            max_pixels=settings.IMAGE_MAX_PIXELS,
+        )
+    return _pool
+
+
+def init_image_pool():
+    """
+    Start the image process pool.
+    """
+    get_image_pool().start()
+    print("Image process pool initialized...")
+
+
+def shutdown_image_pool():
+    """
+    Stop the image process pool, cancelling queued work.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,172 @@
+# app/core/image_store.py
+# Product image ingestion with content-hash deduplication. Every processed
+# upload is recorded once in the images collection (ImageAsset) under the
+# sha256 of its raw bytes; repeat uploads of the same file just take another
+# reference and skip compression and storage entirely. Deleting a product
+# releases its references, and the last release deletes the stored files.
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId, UpdateResponse
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import get_settings
+from app.core.image_pool import get_image_pool
+from app.core.images import VariantSet, variant_params
+from app.core.storage import StoredImage, get_storage
+from app.models.image import ImageAsset
+from app.models.product import ProductImage
+
+MAX_SIZE_KB = 200  # budget of the full-size rendition
+# Perceptual hashes at most this many bits apart count as the same image.
+# Split into PHASH_MAX_DISTANCE + 1 bands, two such hashes always share a band.
+PHASH_MAX_DISTANCE = 3
+PHASH_BANDS = PHASH_MAX_DISTANCE + 1
+
+
+def _sha256_all(payloads: List[bytes]) -> List[str]:
+    return [hashlib.sha256(data).hexdigest() for data in payloads]
+
+
+def _product_image(variant_set: VariantSet, stored: List[StoredImage]) -> ProductImage:
+    """Pair the uploaded renditions of one image back up per size"""
+    sizes: Dict[str, Dict] = {}
+    for rendition, image in zip(variant_set.renditions, stored):
+        size = sizes.setdefault(rendition.variant, {"width": rendition.width, "height": rendition.height})
+        size[rendition.format] = image.url
+    return ProductImage(**sizes)
+
+
+async def _acquire(query: Dict, count: int) -> Optional[ImageAsset]:
+    """Atomically add `count` references (negative to drop) to the asset matching query"""
+    return await ImageAsset.find_one(query).update(
+        {"$inc": {"refcount": count}}, response_type=UpdateResponse.NEW_DOCUMENT
+    )
+
+
+def _phash_bands(phash: str) -> List[str]:
+    width = len(phash) // PHASH_BANDS
+    return [f"{band}:{phash[band * width:(band + 1) * width]}" for band in range(PHASH_BANDS)]
+
+
+def _hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+async def _acquire_similar(phash: str, params: str, count: int) -> Optional[ImageAsset]:
+    """Take references on the closest stored image within PHASH_MAX_DISTANCE, if any"""
+    candidates = await ImageAsset.find(
+        {"phash_bands": {"$in": _phash_bands(phash)}, "params": params}
+    ).limit(50).to_list()
+    close = [(_hamming(phash, c.phash), c.id) for c in candidates if c.phash]
+    close = sorted(item for item in close if item[0] <= PHASH_MAX_DISTANCE)
+    return await _acquire({"_id": close[0][1]}, count) if close else None
+
+
+async def _delete_files(keys: List[str]):
+    storage = get_storage()
+    results = await asyncio.gather(*(storage.delete(key) for key in keys), return_exceptions=True)
+    failed = [key for key, result in zip(keys, results) if isinstance(result, Exception)]
+    if failed:
+        print(f"Failed to delete {len(failed)} stored image file(s): {', '.join(failed)}")
+
+
+async def _create_assets(
+    digests: List[str], payloads: List[bytes], counts: Counter, phashes: Dict[str, str], params: str
+) -> Dict[str, ImageAsset]:
+    """Process, upload and record images that have no stored copy yet"""
+    variant_sets = await get_image_pool().variants_many(payloads, max_size_kb=MAX_SIZE_KB)
+    renditions = [r for variant_set in variant_sets for r in variant_set.renditions]
+    stored = await get_storage().upload_many(
+        [r.data for r in renditions], content_types=[r.content_type for r in renditions]
+    )
+
+    assets = {}
+    uploaded = iter(stored)
+    for digest, variant_set in zip(digests, variant_sets):
+        files = [next(uploaded) for _ in variant_set.renditions]
+        asset = ImageAsset(
+            sha256=digest,
+            params=params,
+            phash=phashes.get(digest),
+            phash_bands=_phash_bands(phashes[digest]) if digest in phashes else [],
+            image=_product_image(variant_set, files),
+            keys=[f.key for f in files],
+            refcount=counts[digest],
+        )
+        try:
+            await asset.insert()
+        except DuplicateKeyError:
+            # A concurrent upload of the same file got there first: share its copy
+            existing = await _acquire({"sha256": digest, "params": params}, counts[digest])
+            if existing is None:  # ...which was released again in the meantime
+                asset.id = None
+                await asset.insert()
+            else:
+                await _delete_files(asset.keys)
+                asset = existing
+        assets[digest] = asset
+    return assets
+
+
+async def store_images(payloads: List[bytes]) -> Tuple[List[ProductImage], List[PydanticObjectId]]:
+    """
+    Store uploaded images, reusing earlier copies of identical files (and, with
+    IMAGE_DEDUP_PERCEPTUAL, of images whose perceptual hash is within
+    PHASH_MAX_DISTANCE bits).
+
+    Returns the images and their ImageAsset ids in input order; the caller owns
+    one reference per returned id and must hand them to release_images() if
+    it does not keep them. Raises ImagePipelineBusy or UploadFailed like the
+    pool and storage backends do.
+    """
+    pool = get_image_pool()
+    params = variant_params(MAX_SIZE_KB, pool.max_long_side, pool.webp)
+    digests = await asyncio.to_thread(_sha256_all, payloads)
+    counts = Counter(digests)
+    payload_for = dict(zip(digests, payloads))
+
+    assets: Dict[str, ImageAsset] = {}
+    try:
+        found = await asyncio.gather(
+            *(_acquire({"sha256": digest, "params": params}, count) for digest, count in counts.items())
+        )
+        assets.update((digest, asset) for digest, asset in zip(counts, found) if asset is not None)
+        missing = [digest for digest in counts if digest not in assets]
+
+        phashes: Dict[str, str] = {}
+        if missing and get_settings().IMAGE_DEDUP_PERCEPTUAL:
+            hashes = await pool.perceptual_hashes([payload_for[digest] for digest in missing])
+            phashes = dict(zip(missing, hashes))
+            found = await asyncio.gather(
+                *(_acquire_similar(phashes[digest], params, counts[digest]) for digest in missing)
+            )
+            assets.update((digest, asset) for digest, asset in zip(missing, found) if asset is not None)
+            missing = [digest for digest in missing if digest not in assets]
+
+        if missing:
+            assets.update(
+                await _create_assets(missing, [payload_for[digest] for digest in missing], counts, phashes, params)
+            )
+    except BaseException:
+        await release_images([assets[digest].id for digest in digests if digest in assets])
+        raise
+
+    return [assets[digest].image for digest in digests], [assets[digest].id for digest in digests]
+
+
+async def release_images(refs: List[PydanticObjectId]):
+    """
+    Drop one reference per id and delete the stored files of images that are
+    no longer used by any product.
+    """
+    for ref, count in Counter(refs).items():
+        asset = await _acquire({"_id": ref}, -count)
+        if asset is None or asset.refcount > 0:
+            continue
+        # Conditional so an upload that re-acquired the image meanwhile keeps it
+        result = await ImageAsset.get_motor_collection().delete_one({"_id": ref, "refcount": {"$lte": 0}})
+        if result.deleted_count:
+            await _delete_files(asset.keys)
@@ -0,0 +1,358 @@
+# app/core/images.py
+# Pure image helpers. Kept free of FastAPI/DB imports so process pool
+# workers can import this module cheaply; PIL itself is only imported by
+# the functions that decode or encode, so the web process never loads it.
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import hashlib
+import io
+import math
+import time
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Quality bounds for the binary search; below MIN_QUALITY we downscale instead
+MAX_QUALITY = 90
+MIN_QUALITY = 40
+LAST_RESORT_QUALITY = 10
+QUALITY_TOLERANCE = 3  # stop searching once the bracket is this narrow
+MIN_SIDE_LIMIT = 256  # do not downscale below this on the shortest side
+
+# Smaller renditions stored next to the full image: (name, longest side, JPEG budget in KB)
+VARIANT_SIZES = (("medium", 800, 80), ("thumb", 320, 25))
+WEBP_QUALITY = 80
+
+
+# Formats accepted for uploads; anything else is rejected before decoding
+SUPPORTED_FORMATS = ("JPEG", "MPO", "PNG", "WEBP", "GIF")  # MPO: multi-picture JPEGs from phone cameras
+JPEG_FORMATS = ("JPEG", "MPO")
+
+
+class InvalidImage(ValueError):
+    """The data is not an image in one of SUPPORTED_FORMATS"""
+
+
+class ImageTooLarge(ValueError):
+    """The image has more pixels than allowed"""
+
+
+@dataclass
+class CompressionResult:
+    """Output of compress_image_with_stats"""
+    data: bytes
+    width: int
+    height: int
+    quality: int
+    encodes: int  # number of JPEG encodes performed, including the final one
+    elapsed_ms: float
+
+
+@dataclass
+class EncodedImage:
+    """One stored rendition of an uploaded image"""
+    variant: str  # "full", "medium" or "thumb"
+    format: str  # "jpeg" or "webp"
+    data: bytes
+    width: int
+    height: int
+
+    @property
+    def content_type(self) -> str:
+        return f"image/{self.format}"
+
+
+@dataclass
+class VariantSet:
+    """Output of build_variants"""
+    renditions: List[EncodedImage]
+    encodes: int
+    elapsed_ms: float
+
+
+def _open_checked(image_data: bytes, max_pixels: Optional[int]) -> "Image.Image":
+    """
+    Open an image lazily (only the header is parsed) and validate its format
+    and pixel count, so oversized images and decompression bombs are refused
+    before any pixel data is decoded.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(image_data))
+    except Image.DecompressionBombError as e:
+        raise ImageTooLarge(str(e)) from e
+    except (UnidentifiedImageError, OSError) as e:
+        raise InvalidImage("Not a recognizable image") from e
+    if image.format not in SUPPORTED_FORMATS:
+        raise InvalidImage(f"Unsupported image format {image.format}; use one of {', '.join(SUPPORTED_FORMATS)}")
+    if max_pixels and image.width * image.height > max_pixels:
+        raise ImageTooLarge(
+            f"Image is {image.width}x{image.height} ({image.width * image.height / 1e6:.0f} MP); "
+            f"the limit is {max_pixels / 1e6:.0f} MP"
+        )
+    return image
+
+
+def inspect_image(image_data: bytes, max_pixels: Optional[int] = None) -> Tuple[str, int, int]:
+    """
+    Validate an upload from its header alone.
+
+    Returns:
+        (format, width, height)
+
+    Raises:
+        InvalidImage: unreadable data or an unsupported format
+        ImageTooLarge: more than max_pixels pixels
+    """
+    image = _open_checked(image_data, max_pixels)
+    return image.format, image.width, image.height
+
+
+def _load_rgb(image_data: bytes, max_long_side: int, max_pixels: Optional[int] = None) -> "Image.Image":
+    """Decode an image to RGB, already scaled down to at most max_long_side"""
+    from PIL import Image
+
+    image = _open_checked(image_data, max_pixels)
+
+    # For JPEGs this makes the decoder itself downscale by 1/2, 1/4 or 1/8,
+    # which is far cheaper than decoding at full size and resizing after.
+    if image.format in JPEG_FORMATS:
+        image.draft('RGB', (max_long_side, max_long_side))
+
+    # Convert to RGB if necessary (for JPEG compatibility)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        # Create a white background
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Single resize to the target long side (no-op for smaller images)
+    image.thumbnail((max_long_side, max_long_side), Image.LANCZOS)
+    return image
+
+
+class _Encoder:
+    """Encodes an image as JPEG and counts how many times it did so"""
+
+    def __init__(self, image: "Image.Image"):
+        self.image = image
+        self.encodes = 0
+
+    def size(self, quality: int) -> int:
+        return len(self.encode(quality, optimize=False))
+
+    def encode(self, quality: int, optimize: bool) -> bytes:
+        self.encodes += 1
+        output = io.BytesIO()
+        self.image.save(output, format='JPEG', quality=quality, optimize=optimize)
+        return output.getvalue()
+
+    def best_quality(self, budget: int, low: int, high: int):
+        """
+        Search for the highest quality in [low, high] whose encode fits the budget,
+        to within QUALITY_TOLERANCE.
+        Returns (quality, size), or (None, size_at_low) when even `low` is too big.
+        """
+        # Small or simple images usually fit straight away at the top quality
+        high_size = self.size(high)
+        if high_size <= budget:
+            return high, high_size
+        size = self.size(low)
+        if size > budget:
+            return None, size
+
+        # Invariant: `low` fits the budget, `high` does not. Encoded size is
+        # roughly exponential in quality, so guess the crossover by
+        # interpolating on log(size) (regula falsi, Illinois variant: when the
+        # same end moves twice in a row the stale end is pulled halfway to the
+        # target so the bracket keeps shrinking from both sides).
+        target = math.log(budget)
+        best = (low, size)
+        log_low, log_high = math.log(size), math.log(high_size)
+        last_side = None
+        while high - low > QUALITY_TOLERANCE:
+            fraction = (target - log_low) / (log_high - log_low)
+            mid = min(max(low + round((high - low) * fraction), low + 1), high - 1)
+            size = self.size(mid)
+            if size <= budget:
+                low, log_low = mid, math.log(size)
+                best = (mid, size)
+                if last_side == "low":
+                    log_high = target + (log_high - target) / 2
+                last_side = "low"
+            else:
+                high, log_high = mid, math.log(size)
+                if last_side == "high":
+                    log_low = target - (target - log_low) / 2
+                last_side = "high"
+        return best
+
+
+def _fit_jpeg(encoder: _Encoder, budget: int) -> int:
+    """
+    Find the JPEG quality (and, if needed, a smaller size) at which
+    encoder.image fits the budget. Downscaling replaces encoder.image.
+    Returns the quality for the final encode.
+    """
+    from PIL import Image
+
+    quality, size = encoder.best_quality(budget, MIN_QUALITY, MAX_QUALITY)
+    while quality is None:
+        # JPEG size scales roughly with pixel count, so shrink both sides by
+        # sqrt(budget / size), with a little headroom to avoid another round.
+        image = encoder.image
+        scale = (budget / size) ** 0.5 * 0.9
+        new_width = int(image.width * scale)
+        new_height = int(image.height * scale)
+        if min(new_width, new_height) < MIN_SIDE_LIMIT:
+            # As a last resort, allow quality to go below MIN_QUALITY at the smallest size
+            scale = MIN_SIDE_LIMIT / min(image.width, image.height)
+            if scale < 1:
+                new_width = max(int(image.width * scale), 1)
+                new_height = max(int(image.height * scale), 1)
+                encoder.image = image.resize((new_width, new_height), Image.LANCZOS)
+            quality, size = encoder.best_quality(budget, LAST_RESORT_QUALITY, MAX_QUALITY)
+            if quality is None:
+                quality = LAST_RESORT_QUALITY
+            break
+        encoder.image = image.resize((new_width, new_height), Image.LANCZOS)
+        quality, size = encoder.best_quality(budget, MIN_QUALITY, MAX_QUALITY)
+    return quality
+
+
+def compress_image_with_stats(
+    image_data: bytes, max_size_kb: int = 200, max_long_side: int = 1600, max_pixels: Optional[int] = None
+) -> CompressionResult:
+    """
+    Compress an image to a maximum file size while maintaining quality.
+
+    The image is decoded and downscaled once to max_long_side, then the JPEG
+    quality is searched (interpolating on encoded size) against the budget
+    using fast (non-optimized) encodes. Only if the lowest acceptable quality is still too large is the
+    image shrunk further, by the ratio estimated from that encode. The final
+    encode uses optimize=True, which can only make the output smaller.
+
+    Args:
+        image_data: Raw bytes of the uploaded image
+        max_size_kb: Maximum file size in KB (default: 200KB)
+        max_long_side: Longest side, in pixels, of the stored image
+        max_pixels: Refuse images with more pixels than this (ImageTooLarge)
+
+    Returns:
+        CompressionResult with the compressed bytes and encode statistics
+    """
+    started = time.perf_counter()
+    encoder = _Encoder(_load_rgb(image_data, max_long_side, max_pixels))
+    quality = _fit_jpeg(encoder, max_size_kb * 1024)
+    data = encoder.encode(quality, optimize=True)
+    return CompressionResult(
+        data=data,
+        width=encoder.image.width,
+        height=encoder.image.height,
+        quality=quality,
+        encodes=encoder.encodes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def build_variants(
+    image_data: bytes,
+    max_size_kb: int = 200,
+    max_long_side: int = 1600,
+    webp: bool = True,
+    max_pixels: Optional[int] = None,
+) -> VariantSet:
+    """
+    Produce every stored rendition of an upload from a single decode.
+
+    The image is decoded once at max_long_side ("full"); the smaller
+    VARIANT_SIZES are resized from that decoded copy. Each variant gets a
+    budget-fitted JPEG and, when webp is set, a WebP at WEBP_QUALITY that is
+    only kept if it is smaller than the JPEG.
+
+    Args:
+        image_data: Raw bytes of the uploaded image
+        max_size_kb: JPEG budget of the full-size variant
+        max_long_side: Longest side, in pixels, of the full-size variant
+        webp: Also encode WebP renditions
+        max_pixels: Refuse images with more pixels than this (ImageTooLarge)
+
+    Returns:
+        VariantSet with the encoded renditions, largest variant first
+    """
+    from PIL import Image
+
+    started = time.perf_counter()
+    full = _load_rgb(image_data, max_long_side, max_pixels)
+    encodes = 0
+    renditions = []
+    for name, long_side, budget_kb in (("full", max_long_side, max_size_kb),) + VARIANT_SIZES:
+        image = full
+        if long_side < max(full.size):
+            image = full.copy()
+            image.thumbnail((long_side, long_side), Image.LANCZOS)
+        encoder = _Encoder(image)
+        quality = _fit_jpeg(encoder, budget_kb * 1024)
+        jpeg = encoder.encode(quality, optimize=True)
+        width, height = encoder.image.size
+        renditions.append(EncodedImage(name, "jpeg", jpeg, width, height))
+        encodes += encoder.encodes
+        if webp:
+            output = io.BytesIO()
+            encoder.image.save(output, format='WEBP', quality=WEBP_QUALITY, method=4)
+            encodes += 1
+            if output.tell() < len(jpeg):
+                renditions.append(EncodedImage(name, "webp", output.getvalue(), width, height))
+
+    return VariantSet(
+        renditions=renditions,
+        encodes=encodes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def variant_params(max_size_kb: int, max_long_side: int, webp: bool) -> str:
+    """
+    Short fingerprint of everything that shapes build_variants output, so
+    stored renditions are not reused after the sizes or budgets change.
+    """
+    spec = repr((max_size_kb, max_long_side, webp, VARIANT_SIZES, WEBP_QUALITY, MAX_QUALITY, MIN_QUALITY))
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+def perceptual_hash(image_data: bytes) -> str:
+    """
+    64-bit difference hash (dHash) of an image as 16 hex digits. Re-encoded
+    or resized copies of the same photo differ in at most a few bits.
+    """
+    from PIL import Image
+
+    image = _open_checked(image_data, None)
+    if image.format in JPEG_FORMATS:
+        image.draft('L', (64, 64))  # decode at 1/8 scale, the hash only needs 9x8 pixels
+    pixels = list(image.convert('L').resize((9, 8), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def compress_image(image_data: bytes, max_size_kb: int = 200) -> bytes:
+    """
+    Compress an image to a maximum file size while maintaining quality.
+
+    Args:
+        image_data: Raw bytes of the uploaded image
+        max_size_kb: Maximum file size in KB (default: 200KB)
+
+    Returns:
+        Compressed image as bytes
+    """
+    return compress_image_with_stats(image_data, max_size_kb).data
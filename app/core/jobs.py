@@ -0,0 +1,239 @@
+# app/core/jobs.py
+# Background processing of product images (IMAGE_PROCESSING_MODE=async).
+# add_product stores the raw uploads and an ImageJob in MongoDB and returns;
+# a JobRunner in every worker process claims queued jobs with a lease, runs
+# them through the same store_images pipeline as synchronous uploads and
+# fills the product's images in with one conditional update.
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import get_settings
+from app.core.events import publish_product_event
+from app.core.image_pool import ImagePipelineBusy, ImageWorkerCrashed
+from app.core.image_store import release_images, store_images
+from app.core.images import ImageTooLarge, InvalidImage
+from app.core.metrics import registry
+from app.core.response_cache import product_cache
+from app.models.job import ImageJob, ImageUpload
+from app.models.product import Product
+
+IMAGE_JOBS = registry.counter("image_jobs_total", "Image job attempts by outcome", ("outcome",))
+
+# Errors that retrying cannot fix
+PERMANENT_ERRORS = (InvalidImage, ImageTooLarge)
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+class JobRunner:
+    """
+    Claims and runs image jobs, at most `concurrency` at a time. Jobs queued
+    by this process start immediately (wake()); jobs from other workers, or
+    left behind by a crashed one once its lease expires, are found by polling.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        poll_interval: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        busy_retry_seconds: float,
+    ):
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.busy_retry_seconds = busy_retry_seconds
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def start(self):
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._claim_loop())
+
+    def wake(self):
+        self._wakeup.set()
+
+    async def stop(self):
+        """Stop claiming and hand running jobs back to the queue"""
+        tasks = [t for t in (self._loop_task, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+
+    async def _claim_loop(self):
+        while True:
+            await self._slots.acquire()
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"Image job claim failed: {e}")
+                job = None
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _claim(self) -> Optional[ImageJob]:
+        """Atomically take the oldest due job, or one whose worker's lease ran out"""
+        now = datetime.utcnow()
+        doc = await ImageJob.get_motor_collection().find_one_and_update(
+            {"$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "locked_until": {"$lt": now}},
+            ]},
+            {"$set": {"status": "running", "locked_until": now + self.lease}, "$inc": {"attempts": 1}},
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return ImageJob.model_validate(doc) if doc else None
+
+    async def _run(self, job: ImageJob):
+        try:
+            await self._process(job)
+        except asyncio.CancelledError:
+            # Shutting down: put the job back without counting the attempt
+            await asyncio.shield(self._requeue(job, 0, count_attempt=False))
+            raise
+        except ImagePipelineBusy as e:
+            if isinstance(e, ImageWorkerCrashed):
+                # Likely a poison image: count the attempt so it cannot loop forever
+                await self._failed(job, e)
+                return
+            await self._requeue(job, self.busy_retry_seconds, count_attempt=False, error=str(e))
+            IMAGE_JOBS.inc(outcome="deferred")
+        except Exception as e:
+            await self._failed(job, e)
+
+    async def _failed(self, job: ImageJob, error: Exception):
+        if isinstance(error, PERMANENT_ERRORS) or job.attempts >= self.max_attempts:
+            await self._give_up(job, error)
+            IMAGE_JOBS.inc(outcome="failed")
+        else:
+            delay = min(self.retry_base_seconds * 2 ** (job.attempts - 1), MAX_RETRY_DELAY_SECONDS)
+            await self._requeue(job, delay, error=str(error))
+            IMAGE_JOBS.inc(outcome="retried")
+            print(f"Image job {job.id} failed (attempt {job.attempts}), retrying in {delay:.0f}s: {error}")
+
+    async def _process(self, job: ImageJob):
+        products = Product.get_motor_collection()
+        if not await products.count_documents({"_id": job.product_id, "image_status": "processing"}, limit=1):
+            # The product was deleted (or already finished by an earlier, slow attempt)
+            await self._complete(job)
+            IMAGE_JOBS.inc(outcome="abandoned")
+            return
+
+        uploads = {u.id: u.data async for u in ImageUpload.find({"_id": {"$in": job.upload_ids}})}
+        if len(uploads) < len(job.upload_ids):
+            raise InvalidImage("Uploaded image data is missing")
+        images, image_refs = await store_images([uploads[upload_id] for upload_id in job.upload_ids])
+
+        result = await products.update_one(
+            {"_id": job.product_id, "image_status": "processing"},
+            {
+                "$set": {
+                    "images": [image.model_dump() for image in images],
+                    "image_urls": [image.full.jpeg for image in images],
+                    "image_refs": image_refs,
+                    "image_status": "ready",
+                },
+                "$inc": {"revision": 1},
+            },
+        )
+        if result.matched_count:
+            await product_cache.invalidate()
+            publish_product_event("update", job.product_id)
+        else:
+            await release_images(image_refs)
+        await self._complete(job)
+        IMAGE_JOBS.inc(outcome="succeeded")
+
+    async def _complete(self, job: ImageJob):
+        await ImageUpload.get_motor_collection().delete_many({"_id": {"$in": job.upload_ids}})
+        await ImageJob.get_motor_collection().delete_one({"_id": job.id})
+
+    async def _requeue(self, job: ImageJob, delay: float, count_attempt: bool = True, error: Optional[str] = None):
+        update = {"$set": {
+            "status": "queued",
+            "run_at": datetime.utcnow() + timedelta(seconds=delay),
+            "locked_until": None,
+            "last_error": error,
+        }}
+        if not count_attempt:
+            update["$inc"] = {"attempts": -1}
+        await ImageJob.get_motor_collection().update_one({"_id": job.id}, update)
+
+    async def _give_up(self, job: ImageJob, error: Exception):
+        print(f"Image job {job.id} failed permanently after {job.attempts} attempt(s): {error}")
+        await ImageJob.get_motor_collection().update_one(
+            {"_id": job.id}, {"$set": {"status": "failed", "locked_until": None, "last_error": str(error)}}
+        )
+        await ImageUpload.get_motor_collection().delete_many({"_id": {"$in": job.upload_ids}})
+        result = await Product.get_motor_collection().update_one(
+            {"_id": job.product_id, "image_status": "processing"},
+            {"$set": {"image_status": "failed"}, "$inc": {"revision": 1}},
+        )
+        await product_cache.invalidate()
+        if result.matched_count:
+            publish_product_event("update", job.product_id)
+
+
+_runner: Optional[JobRunner] = None
+
+
+async def enqueue_image_job(product_id: PydanticObjectId, payloads: List[bytes]) -> ImageJob:
+    """Persist the raw images and queue their processing for the product"""
+    inserted = await ImageUpload.insert_many([ImageUpload(data=data) for data in payloads])
+    job = ImageJob(product_id=product_id, upload_ids=inserted.inserted_ids)
+    await job.insert()
+    if _runner is not None:
+        _runner.wake()
+    return job
+
+
+def init_job_runner():
+    """
+    Start claiming image jobs in this worker.
+    """
+    global _runner
+    if _runner is None:
+        settings = get_settings()
+        _runner = JobRunner(
+            concurrency=settings.JOB_CONCURRENCY,
+            poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+            lease_seconds=settings.JOB_LEASE_SECONDS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+            busy_retry_seconds=settings.IMAGE_RETRY_AFTER_SECONDS,
+        )
+        _runner.start()
+        print("Image job runner initialized...")
+
+
+async def shutdown_job_runner():
+    """
+    Stop the job runner; jobs it was running go back to the queue.
+    """
+    global _runner
+    if _runner is not None:
+        await _runner.stop()
+        _runner = None
@@ -0,0 +1,96 @@
+# app/core/jwks.py
+# Signing keys of an OpenID provider, fetched from its JWKS endpoint and kept
+# for as long as its Cache-Control allows. Once loaded, a background task
+# refetches them shortly before they expire, so token verification never
+# waits on the network; an unknown key id (key rotation) forces a refetch.
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+
+from app.core.http_client import get_http_client
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+DEFAULT_TTL_SECONDS = 3600  # when the response has no usable max-age
+MIN_TTL_SECONDS = 60
+REFRESH_AHEAD = 0.9  # refetch after this fraction of the lifetime has passed
+RETRY_SECONDS = 30  # after a failed background refresh
+MIN_FORCED_REFRESH_SECONDS = 30  # unknown key ids trigger at most one refetch per interval
+
+
+class JWKSUnavailable(Exception):
+    """Raised when the keys cannot be fetched and none are cached"""
+
+
+def _ttl(headers) -> float:
+    match = MAX_AGE_RE.search(headers.get("cache-control", ""))
+    if not match:
+        return DEFAULT_TTL_SECONDS
+    age = headers.get("age", "")
+    age = int(age) if age.isdigit() else 0
+    return max(int(match.group(1)) - age, MIN_TTL_SECONDS)
+
+
+class JWKSCache:
+    """Keys of one JWKS endpoint by key id (`kid`)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: Dict[str, Dict] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict]:
+        """Return the JWK with this key id, or None if the provider does not publish it"""
+        now = time.monotonic()
+        if now >= self._expires_at:
+            await self._refresh(stale_ok=True)
+        elif kid not in self._keys and now - self._attempted_at >= MIN_FORCED_REFRESH_SECONDS:
+            await self._refresh(stale_ok=True)
+        return self._keys.get(kid)
+
+    async def _refresh(self, stale_ok: bool = False):
+        attempted_at = self._attempted_at
+        async with self._lock:
+            if self._attempted_at != attempted_at:
+                return  # another request refreshed while we waited
+            self._attempted_at = time.monotonic()
+            try:
+                response = await get_http_client().get(self.url)
+                response.raise_for_status()
+                keys = {key["kid"]: key for key in response.json()["keys"] if "kid" in key}
+            except Exception as e:
+                if stale_ok and self._keys:
+                    # Keep serving the old keys; try again after a pause, not on every request
+                    print(f"Failed to refresh JWKS from {self.url}, using cached keys: {e}")
+                    self._expires_at = max(self._expires_at, self._attempted_at + RETRY_SECONDS)
+                    return
+                raise JWKSUnavailable(f"Failed to fetch JWKS from {self.url}: {e}") from e
+            now = time.monotonic()
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + _ttl(response.headers)
+            if self._refresher is None:
+                self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        while True:
+            lifetime = self._expires_at - self._fetched_at
+            await asyncio.sleep(max(self._fetched_at + lifetime * REFRESH_AHEAD - time.monotonic(), 0))
+            try:
+                await self._refresh()
+            except JWKSUnavailable as e:
+                print(f"{e}; retrying in {RETRY_SECONDS}s")
+                await asyncio.sleep(RETRY_SECONDS)
+
+    async def stop(self):
+        """Stop background refreshing; keys are fetched again on next use"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+        self._keys = {}
+        self._fetched_at = self._attempted_at = self._expires_at = 0.0
@@ -0,0 +1,42 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """Raised when a feed cursor cannot be decoded"""
+
+
+def encode_cursor(date_added: datetime, doc_id: Any) -> str:
+    """Encode the (date_added, _id) position of the last item on a page into an opaque token"""
+    raw = json.dumps({"d": date_added.isoformat(), "i": str(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a token produced by encode_cursor back into (date_added, _id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["d"]), ObjectId(data["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_after(cursor: str) -> Dict[str, Any]:
+    """
+    Build the filter selecting documents strictly after the cursor position
+    for a feed sorted by (date_added DESC, _id DESC).
+    """
+    date_added, doc_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"date_added": {"$lt": date_added}},
+            {"date_added": date_added, "_id": {"$lt": doc_id}},
+        ]
+    }
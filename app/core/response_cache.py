@@ -0,0 +1,201 @@
+# app/core/response_cache.py
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.compression import Encoder, negotiate
+from app.core.config import get_settings
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    # Compressed copies of body by content coding, added as clients ask for them
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached responses. Invalidation works by bumping a per-namespace
+    generation number that is part of every key, so old entries simply stop
+    being read and age out by TTL.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        ...
+
+    @abstractmethod
+    async def get_generation(self, namespace: str) -> int:
+        ...
+
+    @abstractmethod
+    async def bump_generation(self, namespace: str):
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process backend. Other workers only see invalidations once their entries expire."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        self._entries.set(key, value, ttl=ttl)
+
+    async def get_generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def bump_generation(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisBackend(CacheBackend):
+    """Shared backend so every worker sees the same entries and invalidations (needs `redis`)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # optional dependency, only needed for this backend
+
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self._redis.get(key)
+        if raw is None:
+            return None
+        header, _, data = raw.partition(b"\n")
+        meta = json.loads(header)
+        # The identity body is followed by each compressed copy, sizes in the header
+        body, offset, encodings = data[:meta["length"]], meta["length"], {}
+        for encoding, size in meta.get("encodings", {}).items():
+            encodings[encoding] = data[offset:offset + size]
+            offset += size
+        return CachedResponse(body=body, etag=meta["etag"], media_type=meta["media_type"],
+                              encodings=encodings, created_at=meta.get("created_at", time.time()))
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        header = json.dumps({
+            "etag": value.etag,
+            "media_type": value.media_type,
+            "created_at": value.created_at,
+            "length": len(value.body),
+            "encodings": {encoding: len(data) for encoding, data in value.encodings.items()},
+        }).encode()
+        data = b"".join([header, b"\n", value.body, *value.encodings.values()])
+        await self._redis.set(key, data, px=int(ttl * 1000))
+
+    async def get_generation(self, namespace: str) -> int:
+        return int(await self._redis.get(f"gen:{namespace}") or 0)
+
+    async def bump_generation(self, namespace: str):
+        await self._redis.incr(f"gen:{namespace}")
+
+
+class ResponseCache:
+    """
+    Caches serialized GET responses for one namespace, keyed by path and query
+    string, and answers conditional requests with 304 Not Modified. Bodies
+    are compressed for the client's Accept-Encoding once per entry and
+    encoding, then served from the cache like the identity body.
+    """
+
+    def __init__(self, namespace: str, backend_factory: Callable[[], CacheBackend]):
+        self.namespace = namespace
+        self._backend_factory = backend_factory
+        self._backend: Optional[CacheBackend] = None
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Created on first use so importing this module does not read settings
+        if self._backend is None:
+            self._backend = self._backend_factory()
+        return self._backend
+
+    @property
+    def ttl(self) -> float:
+        return get_settings().RESPONSE_CACHE_TTL_SECONDS
+
+    def _key(self, request: Request, generation: int) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{self.namespace}:{generation}:{request.url.path}?{query}"
+
+    async def respond(self, request: Request, build: Callable[[], Awaitable[bytes]]) -> Response:
+        """Serve the cached body for this request, calling build() to produce it on a miss"""
+        key = self._key(request, await self.backend.get_generation(self.namespace))
+        cached = await self.backend.get(key)
+        status = "HIT"
+        if cached is None:
+            status = "MISS"
+            body = await build()
+            cached = CachedResponse(body=body, etag=make_etag(body))
+            await self.backend.set(key, cached, self.ttl)
+
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "X-Cache": status, "Vary": "Accept-Encoding"}
+        encoder = negotiate(request.headers.get("accept-encoding"))
+        if encoder is not None and len(cached.body) < get_settings().COMPRESSION_MIN_SIZE:
+            encoder = None
+        if encoder is not None:
+            # The compressed bytes are another representation: weak validator
+            headers["ETag"] = "W/" + cached.etag
+
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        if encoder is None:
+            return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+        headers["Content-Encoding"] = encoder.name
+        body = await self._encoded(key, cached, encoder)
+        return Response(content=body, media_type=cached.media_type, headers=headers)
+
+    async def _encoded(self, key: str, cached: CachedResponse, encoder: Encoder) -> bytes:
+        data = cached.encodings.get(encoder.name)
+        if data is None:
+            data = encoder.compress(cached.body)
+            cached.encodings[encoder.name] = data
+            # Store it with the entry, without extending the entry's lifetime
+            remaining = self.ttl - (time.time() - cached.created_at)
+            if remaining > 0:
+                await self.backend.set(key, cached, remaining)
+        return data
+
+    async def invalidate(self):
+        """Drop every cached response in this namespace"""
+        await self.backend.bump_generation(self.namespace)
+
+
+def _make_backend() -> CacheBackend:
+    settings = get_settings()
+    if settings.RESPONSE_CACHE_URL:
+        return RedisBackend(settings.RESPONSE_CACHE_URL)
+    return MemoryBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+product_cache = ResponseCache("products", _make_backend)
@@ -0,0 +1,54 @@
+# app/core/serialization.py
+# Lean read path: raw Motor documents -> plain dicts -> JSON bytes via orjson,
+# skipping the Beanie model, ProductResponse and FastAPI response_model passes.
+from typing import Any, Dict
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+# Fields (and defaults) of ProductResponse, fetched as a projection
+PRODUCT_FIELDS: Dict[str, Any] = {
+    "name": None,
+    "description": None,
+    "price": None,
+    "location": None,
+    "category": None,
+    "tags": [],
+    "date_added": None,
+    "seller_id": None,
+    "image_urls": [],
+    "images": [],
+    "image_status": "ready",
+    "is_sold": False,
+    "revision": 0,
+}
+
+PRODUCT_PROJECTION = {field: 1 for field in PRODUCT_FIELDS}
+
+
+def product_to_api(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a raw product document like ProductResponse (id as str, defaults filled in)"""
+    out = {"id": str(doc["_id"])}
+    for field, default in PRODUCT_FIELDS.items():
+        value = doc.get(field, default)
+        out[field] = default if value is None and default is not None else value
+    return out
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes; datetimes are written in ISO 8601 like Pydantic does"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,171 @@
+# app/core/storage.py
+import asyncio
+import io
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import IMAGE_UPLOAD_SECONDS, timed_phase
+
+
+class UploadFailed(Exception):
+    """Raised when an image could not be stored after all retries"""
+
+
+@dataclass
+class StoredImage:
+    url: str
+    key: str  # backend identifier used to delete the image later
+
+
+class ImageStorage(ABC):
+    """
+    Where product images live. Subclasses implement the blocking _put/_remove;
+    the base class runs them on a bounded thread pool with a per-upload
+    timeout and retries, so uploads never block the event loop and several
+    images go out concurrently.
+    """
+
+    name = "storage"  # backend label on the upload metrics
+
+    def __init__(self, concurrency: int, timeout: float, retries: int):
+        self.timeout = timeout
+        self.retries = retries
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="image-upload")
+
+    @abstractmethod
+    def _put(self, data: bytes, content_type: str) -> StoredImage:
+        """Store the bytes and return where they ended up (blocking)"""
+
+    @abstractmethod
+    def _remove(self, key: str) -> None:
+        """Delete a stored image (blocking)"""
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(self._executor, fn, *args), self.timeout)
+
+    async def upload(self, data: bytes, content_type: str = "image/jpeg") -> StoredImage:
+        """Store one image, retrying with exponential backoff on failure"""
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            started = time.perf_counter()
+            try:
+                stored = await self._run(self._put, data, content_type)
+            except Exception as e:
+                IMAGE_UPLOAD_SECONDS.observe(time.perf_counter() - started, backend=self.name, outcome="failed")
+                last_error = e
+            else:
+                IMAGE_UPLOAD_SECONDS.observe(time.perf_counter() - started, backend=self.name, outcome="succeeded")
+                return stored
+        raise UploadFailed(f"Image upload failed after {self.retries + 1} attempts: {last_error}") from last_error
+
+    async def upload_many(
+        self,
+        payloads: List[bytes],
+        content_type: str = "image/jpeg",
+        content_types: Optional[List[str]] = None,
+    ) -> List[StoredImage]:
+        """Store several images concurrently, preserving input order; content_types overrides content_type per item"""
+        types = content_types or [content_type] * len(payloads)
+        with timed_phase("upload"):
+            return await asyncio.gather(*(self.upload(data, kind) for data, kind in zip(payloads, types)))
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._remove, key)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CloudinaryStorage(ImageStorage):
+    """Default backend: uploads to Cloudinary (configured by init_cloudinary)"""
+
+    name = "cloudinary"
+
+    def _put(self, data: bytes, content_type: str) -> StoredImage:
+        # Imported (and configured) on the first upload rather than at startup
+        import cloudinary.uploader
+        from app.core.cloudinary_config import init_cloudinary
+
+        init_cloudinary()
+        result = cloudinary.uploader.upload(
+            io.BytesIO(data),
+            resource_type="image",
+            timeout=self.timeout,
+        )
+        return StoredImage(url=result["url"], key=result["public_id"])
+
+    def _remove(self, key: str) -> None:
+        import cloudinary.uploader
+        from app.core.cloudinary_config import init_cloudinary
+
+        init_cloudinary()
+        cloudinary.uploader.destroy(key, resource_type="image", timeout=self.timeout)
+
+
+class LocalStorage(ImageStorage):
+    """
+    Writes images to a local directory served by the app under /media.
+    Meant for development and offline load tests of the upload path.
+    """
+
+    name = "local"
+    EXTENSIONS = {"image/jpeg": ".jpg", "image/webp": ".webp", "image/png": ".png"}
+
+    def __init__(self, directory: str, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(directory, exist_ok=True)
+
+    def _put(self, data: bytes, content_type: str) -> StoredImage:
+        key = uuid.uuid4().hex + self.EXTENSIONS.get(content_type, "")
+        with open(os.path.join(self.directory, key), "wb") as f:
+            f.write(data)
+        return StoredImage(url=f"{self.base_url}/{key}", key=key)
+
+    def _remove(self, key: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, os.path.basename(key)))
+        except FileNotFoundError:
+            pass
+
+
+_storage: Optional[ImageStorage] = None
+
+
+def get_storage() -> ImageStorage:
+    """Return the configured image storage backend, creating it on first use"""
+    global _storage
+    if _storage is None:
+        settings = get_settings()
+        options = dict(
+            concurrency=settings.UPLOAD_CONCURRENCY,
+            timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+            retries=settings.UPLOAD_RETRIES,
+        )
+        if settings.IMAGE_STORAGE_BACKEND == "local":
+            _storage = LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_URL, **options)
+        elif settings.IMAGE_STORAGE_BACKEND == "cloudinary":
+            _storage = CloudinaryStorage(**options)
+        else:
+            raise ValueError(f"Unknown IMAGE_STORAGE_BACKEND: {settings.IMAGE_STORAGE_BACKEND}")
+    return _storage
+
+
+def shutdown_storage():
+    """
+    Release the upload thread pool.
+    """
+    global _storage
+    if _storage is not None:
+        _storage.close()
+        _storage = None
@@ -0,0 +1,95 @@
+# app/core/uploads.py
+# Bounded ingestion of multipart image uploads. The request body is capped
+# while it streams in (before Starlette spools it), each file is read from
+# its spool at most once and never past its limit, and the image header is
+# checked for format and pixel count before anything is decoded.
+from typing import List
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.images import ImageTooLarge, InvalidImage, inspect_image
+
+
+def _mb(size: int) -> str:
+    return f"{round(size / (1024 * 1024), 1):g}MB"
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects multipart requests whose body exceeds UPLOAD_MAX_REQUEST_BYTES
+    with 413: immediately when Content-Length says so, otherwise as soon as
+    the streamed body crosses the limit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        limit = get_settings().UPLOAD_MAX_REQUEST_BYTES
+        detail = f"Request body is larger than {_mb(limit)}"
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                return value.lower().startswith(b"multipart/form-data")
+        return False
+
+
+async def read_image_upload(upload: UploadFile) -> bytes:
+    """
+    Read one uploaded image, enforcing UPLOAD_MAX_FILE_BYTES and
+    IMAGE_MAX_PIXELS. Raises HTTPException 413 for oversized files or images
+    and 415 for data that is not a supported image.
+    """
+    settings = get_settings()
+    limit = settings.UPLOAD_MAX_FILE_BYTES
+    too_large = HTTPException(status_code=413, detail=f"{upload.filename} is larger than {_mb(limit)}")
+    # Starlette counted the bytes while spooling, so most oversized files are refused unread
+    if upload.size is not None and upload.size > limit:
+        raise too_large
+    data = await upload.read(limit + 1)
+    if len(data) > limit:
+        raise too_large
+
+    try:
+        # Header parsing only, but the first call also imports PIL, so keep it off the loop
+        await run_in_threadpool(inspect_image, data, settings.IMAGE_MAX_PIXELS)
+    except ImageTooLarge as e:
+        raise HTTPException(status_code=413, detail=f"{upload.filename}: {e}")
+    except InvalidImage as e:
+        raise HTTPException(status_code=415, detail=f"{upload.filename}: {e}")
+    return data
+
+
+async def read_image_uploads(uploads: List[UploadFile]) -> List[bytes]:
+    """Read and validate every image of a request (see read_image_upload)"""
+    max_files = get_settings().UPLOAD_MAX_FILES
+    if len(uploads) > max_files:
+        raise HTTPException(status_code=400, detail=f"At most {max_files} images per product")
+    return [await read_image_upload(upload) for upload in uploads]
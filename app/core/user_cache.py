@@ -0,0 +1,36 @@
+# app/core/user_cache.py
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+_token_cache: Optional[TTLCache] = None
+_user_cache: Optional[TTLCache] = None
+
+
+def get_token_cache() -> TTLCache:
+    """Decoded JWT payloads keyed by the raw token; entries never outlive the token's exp"""
+    global _token_cache
+    if _token_cache is None:
+        settings = get_settings()
+        _token_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+    return _token_cache
+
+
+def get_user_cache() -> TTLCache:
+    """User document snapshots keyed by user id"""
+    global _user_cache
+    if _user_cache is None:
+        settings = get_settings()
+        _user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+    return _user_cache
+
+
+def invalidate_user(user_id: Any):
+    """Drop the cached snapshot of a user, e.g. after their document changed"""
+    get_user_cache().pop(str(user_id))
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters and sizes of the authentication caches"""
+    return {"tokens": get_token_cache().stats(), "users": get_user_cache().stats()}
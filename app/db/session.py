@@ -1,18 +1,176 @@
 # app/db/session.py
+import threading
+from typing import Dict, Optional
+
 import motor.motor_asyncio
 from beanie import init_beanie
-from app.core.config import settings
+from pymongo import monitoring
+from app.core.config import get_settings
+from app.core.metrics import MONGO_COMMAND_SECONDS, record_phase
+from app.models.image import ImageAsset
+from app.models.job import ImageJob, ImageUpload
 from app.models.product import Product
 from app.models.user import User
 
+# Upper bounds (seconds) of the checkout wait-time buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool statistics collected from pymongo's CMAP events.
+
+    Callbacks arrive on Motor's worker threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.open = 0  # connections currently established
+            self.in_use = 0  # connections currently checked out
+            self.waiting = 0  # checkouts started but not yet satisfied
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last one is +Inf
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+
+    def connection_checked_out(self, event):
+        wait = event.duration or 0.0
+        with self._lock:
+            self.waiting -= 1
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            index = next((i for i, bound in enumerate(WAIT_BUCKETS) if wait <= bound), len(WAIT_BUCKETS))
+            self.wait_buckets[index] += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "max_pool_size": get_settings().MONGO_MAX_POOL_SIZE,
+                "open": self.open,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+                "wait_buckets": dict(zip([str(b) for b in WAIT_BUCKETS] + ["+Inf"], self.wait_buckets)),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Records the duration of every MongoDB command and attributes it to the
+    request that issued it (the db entry of Server-Timing).
+    """
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, outcome: str):
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_SECONDS.observe(seconds, command=event.command_name, outcome=outcome)
+        record_phase("db", seconds)
+
+    def succeeded(self, event):
+        self._record(event, "succeeded")
+
+    def failed(self, event):
+        self._record(event, "failed")
+
+
+command_metrics = CommandMetrics()
+
+_client: Optional[motor.motor_asyncio.AsyncIOMotorClient] = None
+
+
+def get_client() -> motor.motor_asyncio.AsyncIOMotorClient:
+    """Return the process-wide Motor client (init_db must have run)"""
+    if _client is None:
+        raise RuntimeError("Database is not initialized; call init_db() first")
+    return _client
+
+
 async def init_db():
     """
     Initializes the database connection and Beanie ODM.
+    Safe to call more than once; later calls reuse the existing client.
     """
+    global _client
+    if _client is not None:
+        return
+
+    settings = get_settings()
     client = motor.motor_asyncio.AsyncIOMotorClient(
-        settings.DATABASE_URL
+        settings.DATABASE_URL,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        readPreference=settings.MONGO_READ_PREFERENCE,
+        event_listeners=[pool_metrics, command_metrics],
     )
-    
-    # Initialize Beanie with the Product and User document models
-    await init_beanie(database=client.get_default_database(), document_models=[Product, User])
-    print("Database connection initialized...")
\ No newline at end of file
+
+    # Initialize Beanie with the document models
+    await init_beanie(database=client.get_default_database(), document_models=[Product, User, ImageAsset, ImageJob, ImageUpload])
+    _client = client
+    print("Database connection initialized...")
+
+
+def close_db():
+    """
+    Close the Motor client and its connection pool.
+    """
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+        print("Database connection closed...")
@@ -1,12 +1,28 @@
 # app/main.py
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from app.api.api import api_router
-from app.db.session import init_db
-from app.core.cloudinary_config import init_cloudinary
+from app.db.session import init_db, close_db, pool_metrics
+from app.core.image_pool import get_image_pool, init_image_pool, shutdown_image_pool
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.compression import CompressionMiddleware
+from app.core.uploads import UploadSizeLimitMiddleware
+from app.core.user_cache import cache_stats
+from app.core.storage import shutdown_storage
+from app.core.jobs import init_job_runner, shutdown_job_runner
+from app.core.events import init_product_events, shutdown_product_events, subscriber_count
+from app.core.http_client import shutdown_http_client
+from app.core.auth import shutdown_google_auth
+from app.core.config import get_settings, validate_settings
 
 app = FastAPI(title="Student Store API")
 
+# Caps multipart bodies while they stream in, before they are parsed and spooled.
+# Added before CORS so its 413 responses still carry the CORS headers.
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +41,46 @@ app.add_middleware(
     expose_headers=["*"],  # Expose all headers
 )
 
+# Compresses JSON/NDJSON responses for clients that accept gzip, br or zstd.
+# Inside the metrics middleware so response sizes are counted as sent.
+app.add_middleware(CompressionMiddleware)
+
+# Added last so it is outermost and times everything below it, CORS included
+app.add_middleware(MetricsMiddleware)
+
+# Values that already live elsewhere are read when /metrics is scraped
+registry.collector(
+    "mongodb_pool_connections", "gauge", "MongoDB pool connections by state",
+    lambda: [({"state": state}, pool_metrics.snapshot()[state]) for state in ("open", "in_use", "waiting")],
+)
+registry.collector(
+    "mongodb_pool_checkouts_total", "counter", "MongoDB pool checkouts by outcome",
+    lambda: [
+        ({"outcome": "succeeded"}, pool_metrics.snapshot()["checkouts"]),
+        ({"outcome": "failed"}, pool_metrics.snapshot()["checkout_failures"]),
+    ],
+)
+registry.collector(
+    "mongodb_pool_checkout_wait_seconds_total", "counter", "Total time spent waiting for a pooled connection",
+    lambda: [({}, pool_metrics.snapshot()["wait_seconds_total"])],
+)
+registry.collector(
+    "image_pipeline_pending", "gauge", "Images queued or being compressed",
+    lambda: [({}, get_image_pool().pending)],
+)
+registry.collector(
+    "product_event_subscribers", "gauge", "Open product event streams",
+    lambda: [({}, subscriber_count())],
+)
+registry.collector(
+    "auth_cache_requests_total", "counter", "Token and user cache lookups by result",
+    lambda: [
+        ({"cache": name, "result": result}, stats[result])
+        for name, stats in cache_stats().items()
+        for result in ("hits", "misses")
+    ],
+)
+
 @app.get("/")
 async def root():
     """
@@ -37,12 +93,52 @@ async def root():
         "api_base": "/api/v1"
     }
 
+@app.get("/health")
+async def health():
+    """
+    Liveness check with MongoDB connection pool statistics for this worker.
+    """
+    return {"status": "ok", "db_pool": pool_metrics.snapshot()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus text exposition of this worker's request, database and image metrics.
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
 @app.on_event("startup")
 async def on_startup():
     """
-    Connect to the database and initialize Cloudinary when the application starts.
+    Connect to the database and start the image workers, job runner (async
+    image processing only) and product event stream when the application starts.
+    Cloudinary is configured lazily on the first upload.
     """
+    validate_settings()
+    settings = get_settings()
     await init_db()
-    init_cloudinary()
+    init_image_pool()
+    # In sync mode nothing queues jobs, so the runner would only poll an empty collection
+    if settings.IMAGE_PROCESSING_MODE == "async" or settings.JOB_DRAIN_IN_SYNC_MODE:
+        init_job_runner()
+    init_product_events()
+
+    # Serve locally stored images when not using Cloudinary
+    if settings.IMAGE_STORAGE_BACKEND == "local" and not any(r.name == "media" for r in app.routes):
+        app.mount("/media", StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False), name="media")
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Stop product events, image jobs, image and upload workers, close outbound
+    HTTP connections and the database pool when the application shuts down.
+    """
+    await shutdown_product_events()
+    await shutdown_job_runner()
+    shutdown_image_pool()
+    shutdown_storage()
+    await shutdown_google_auth()
+    await shutdown_http_client()
+    close_db()
 
 app.include_router(api_router, prefix="/api/v1")
\ No newline at end of file
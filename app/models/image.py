@@ -0,0 +1,29 @@
+# app/models/image.py
+from beanie import Document
+from pydantic import Field
+from typing import List, Optional
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel
+from app.models.product import ProductImage
+
+class ImageAsset(Document):
+    """
+    One processed and stored upload, shared by every product that uses the
+    same image. Products point at it through Product.image_refs; when the
+    last reference goes away the renditions are deleted from storage.
+    """
+    sha256: str  # hash of the raw uploaded bytes
+    params: str  # fingerprint of the processing settings the renditions were built with
+    phash: Optional[str] = None  # perceptual hash, when perceptual dedup is enabled
+    phash_bands: List[str] = []  # "<band>:<4 hex digits>" slices of phash for near-match lookups
+    image: ProductImage
+    keys: List[str] = []  # storage keys of every rendition
+    refcount: int = 1
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "images"
+        indexes = [
+            IndexModel([("sha256", ASCENDING), ("params", ASCENDING)], unique=True, name="content"),
+            IndexModel([("phash_bands", ASCENDING), ("params", ASCENDING)], name="perceptual"),
+        ]
@@ -0,0 +1,36 @@
+# app/models/job.py
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from typing import List, Literal, Optional
+from datetime import datetime
+from pymongo import ASCENDING, IndexModel
+
+class ImageUpload(Document):
+    """Raw bytes of one uploaded image, kept until its ImageJob has finished"""
+    data: bytes  # bounded by UPLOAD_MAX_FILE_BYTES, which must stay under MongoDB's 16MB document limit
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "image_uploads"
+
+class ImageJob(Document):
+    """
+    Deferred image processing for one product (IMAGE_PROCESSING_MODE=async).
+    Jobs live in MongoDB so they survive restarts; workers claim them with a
+    lease and retry failures with exponential backoff.
+    """
+    product_id: PydanticObjectId
+    upload_ids: List[PydanticObjectId]  # ImageUpload ids, in image order
+    status: Literal["queued", "running", "failed"] = "queued"  # finished jobs are deleted
+    attempts: int = 0
+    run_at: datetime = Field(default_factory=datetime.utcnow)  # not claimed before this time
+    locked_until: Optional[datetime] = None  # lease of the worker running it
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "image_jobs"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="claim"),
+            IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="expired_leases"),
+        ]
@@ -1,9 +1,23 @@
 # app/models/product.py
-from beanie import Document
-from pydantic import Field
-from typing import List, Optional, Any
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Any
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+class ImageVariant(BaseModel):
+    """One size of a product image; webp is only set when it is smaller than the JPEG"""
+    width: int
+    height: int
+    jpeg: str
+    webp: Optional[str] = None
+
+class ProductImage(BaseModel):
+    """Every stored size of one uploaded image (see app.core.images.build_variants)"""
+    full: ImageVariant
+    medium: ImageVariant
+    thumb: ImageVariant
 
 class Product(Document):
     # Let Beanie handle the _id field automatically
@@ -12,17 +26,20 @@ class Product(Document):
     price: float
     date_added: datetime = Field(default_factory=datetime.utcnow)
     seller_id: str  # MongoDB ObjectId as string
-    image_urls: List[str] = []
+    image_urls: List[str] = []  # full-size JPEG URLs, one per image
+    images: List[ProductImage] = []  # per-size URLs and dimensions, same order as image_urls
+    image_refs: List[PydanticObjectId] = []  # ImageAsset ids backing `images`, released on delete
+    # "processing" while a background job builds the images (IMAGE_PROCESSING_MODE=async)
+    image_status: Literal["ready", "processing", "failed"] = "ready"
     location: str
     category: str
     tags: Optional[List[str]] = []
     is_sold: bool = False
+    # Bumped by every write; clients send it back to detect concurrent edits
+    revision: int = 0
 
     # No conversion hooks needed; we now persist clean string IDs only
 
-    class Settings:
-        name = "products"
-
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -37,4 +54,38 @@ class Product(Document):
     }
 
     class Settings:
-        name = "products"  # This is the name of the MongoDB collection
\ No newline at end of file
+        name = "products"  # This is the name of the MongoDB collection
+        # The home feed is sorted by (date_added, _id) newest first; every
+        # filterable prefix ends with that pair so pages are index-bounded.
+        indexes = [
+            IndexModel([("date_added", DESCENDING), ("_id", DESCENDING)], name="feed"),
+            IndexModel(
+                [("is_sold", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+                name="feed_is_sold",
+            ),
+            IndexModel(
+                [("category", ASCENDING), ("is_sold", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+                name="feed_category",
+            ),
+            IndexModel(
+                [("location", ASCENDING), ("is_sold", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+                name="feed_location",
+            ),
+            IndexModel(
+                [("tags", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+                name="feed_tags",
+            ),
+            # A seller's own listings (/users/me/products) and their stats
+            IndexModel(
+                [("seller_id", ASCENDING), ("is_sold", ASCENDING), ("date_added", DESCENDING), ("_id", DESCENDING)],
+                name="seller",
+            ),
+            # Relevance-ranked search (/products/search); a match in the name
+            # counts far more than one buried in the description.
+            IndexModel(
+                [("name", TEXT), ("tags", TEXT), ("description", TEXT)],
+                weights={"name": 10, "tags": 5, "description": 1},
+                default_language="english",
+                name="search_text",
+            ),
+        ]
\ No newline at end of file
@@ -1,7 +1,9 @@
-from beanie import Document
+from beanie import Document, UpdateResponse
 from typing import Optional
 from datetime import datetime
 from pydantic import EmailStr, Field
+from pymongo import ASCENDING, IndexModel
+from app.core.user_cache import invalidate_user
 
 class User(Document):
     email: EmailStr
@@ -15,9 +17,22 @@ class User(Document):
     is_verified: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: int = 0  # bumped by every update_fields call
+    last_login_at: Optional[datetime] = None
     
     class Settings:
         name = "users"
+        # Login upserts by email; both keys must identify at most one user
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True, name="email"),
+            IndexModel(
+                [("oauth_provider", ASCENDING), ("oauth_id", ASCENDING)],
+                unique=True,
+                # Users created before OAuth ids were stored have none
+                partialFilterExpression={"oauth_id": {"$type": "string"}},
+                name="oauth_account",
+            ),
+        ]
     
     class Config:
         json_schema_extra = {
@@ -32,7 +47,21 @@ class User(Document):
             }
         }
     
+    async def update_fields(self, **fields):
+        """
+        Atomically $set the given fields plus updated_at in a single
+        find_one_and_update, and refresh this instance from the result.
+        """
+        fields["updated_at"] = datetime.utcnow()
+        updated = await User.find_one(User.id == self.id).update(
+            {"$set": fields, "$inc": {"revision": 1}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        invalidate_user(self.id)
+        if updated is not None:
+            for name in type(self).model_fields:
+                setattr(self, name, getattr(updated, name))
+
     async def update_timestamp(self):
         """Update the updated_at timestamp"""
-        self.updated_at = datetime.utcnow()
-        await self.save()
+        await self.update_fields()
@@ -1,7 +1,8 @@
 # app/schema/product.py
-from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, AliasChoices, field_validator
+from typing import List, Literal, Optional
 from datetime import datetime
+from app.models.product import ProductImage
 
 class ProductBase(BaseModel):
     name: str
@@ -22,13 +23,27 @@ class ProductUpdate(BaseModel):
     category: Optional[str] = None
     tags: Optional[List[str]] = None
     is_sold: Optional[bool] = None
+    # When set, the update only applies if the product is still at this revision
+    expected_revision: Optional[int] = None
+
+    # Fields may be left out, but required product fields cannot be cleared
+    @field_validator('name', 'price', 'location', 'category', 'is_sold')
+    @classmethod
+    def _not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
 
 class ProductResponse(ProductBase):
-    id: str  # Changed from UUID to str
+    # Accept "_id" too so raw/projected Mongo documents validate directly
+    id: str = Field(validation_alias=AliasChoices("id", "_id"))  # Changed from UUID to str
     date_added: Optional[datetime] = None
     seller_id: str  # Changed from UUID to str
     image_urls: List[str] = []
+    images: List[ProductImage] = []
+    image_status: Literal["ready", "processing", "failed"] = "ready"
     is_sold: bool = False
+    revision: int = 0
 
     # Pydantic v2 config
     model_config = ConfigDict(from_attributes=True)
@@ -38,3 +53,71 @@ class ProductResponse(ProductBase):
     @classmethod
     def _cast_id_to_str(cls, value):
         return str(value) if value is not None else ""
+
+
+class ProductFeedPage(BaseModel):
+    items: List[ProductResponse] = []
+    # Opaque token for the next page; None when this is the last page
+    next_cursor: Optional[str] = None
+
+
+class SellerStats(BaseModel):
+    active: int = 0
+    sold: int = 0
+    total: int = 0
+    active_value: float = 0.0  # summed price of unsold listings
+    sold_value: float = 0.0
+
+class SellerListingsPage(ProductFeedPage):
+    # Only on the first page (no cursor); later pages leave it out
+    stats: Optional[SellerStats] = None
+
+
+class ProductSearchHit(ProductResponse):
+    # Relevance from the weighted text index; higher is better
+    score: float = 0.0
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class PriceBucket(BaseModel):
+    min: float
+    max: Optional[float] = None  # None for the open-ended top bucket
+    count: int
+
+class ProductSearchFacets(BaseModel):
+    category: List[FacetCount] = []
+    location: List[FacetCount] = []
+    price: List[PriceBucket] = []
+
+class ProductSearchPage(BaseModel):
+    items: List[ProductSearchHit] = []
+    total: int = 0
+    facets: ProductSearchFacets = ProductSearchFacets()
+
+
+# Bulk operations accept at most this many items per request
+BULK_MAX_ITEMS = 500
+
+class BulkProductIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkProductCreate(BaseModel):
+    items: List[ProductCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkProductPatch(BaseModel):
+    id: str
+    changes: ProductUpdate
+
+class BulkProductUpdate(BaseModel):
+    items: List[BulkProductPatch] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    id: Optional[str] = None
+    status: Literal["created", "updated", "deleted", "not_found", "invalid_id", "conflict", "forbidden"]
+
+class BulkResult(BaseModel):
+    succeeded: int = 0
+    failed: int = 0
+    results: List[BulkItemResult] = []
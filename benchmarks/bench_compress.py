@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the image compressor against the previous (stepwise) algorithm.
+
+Usage:
+    python benchmarks/bench_compress.py [IMAGE_DIR] [--max-size-kb 200] [--repeat 3]
+
+Without IMAGE_DIR a synthetic corpus of photo-like JPEGs and PNGs is generated.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.images import compress_image_with_stats  # noqa: E402
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def legacy_compress_image(image_data: bytes, max_size_kb: int = 200):
+    """
+    The original compress_image loop: quality steps of 5, then 10% downscales,
+    each attempt a full optimize=True encode. Returns (bytes, encodes).
+    """
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    quality = 90
+    output = io.BytesIO()
+    attempts = 0
+    min_side_limit = 256
+    while True:
+        attempts += 1
+        if attempts > 30:
+            attempts -= 1
+            break
+
+        output.seek(0)
+        output.truncate()
+        image.save(output, format='JPEG', quality=quality, optimize=True)
+
+        if len(output.getvalue()) // 1024 <= max_size_kb:
+            break
+        if quality > 40:
+            quality -= 5
+            continue
+
+        new_width = int(image.width * 0.9)
+        new_height = int(image.height * 0.9)
+        if min(new_width, new_height) <= min_side_limit:
+            if quality > 10:
+                quality -= 5
+                continue
+            break
+        image = image.resize((new_width, new_height), Image.LANCZOS)
+
+    return output.getvalue(), attempts
+
+
+def synthetic_corpus():
+    """Photo-like test images: smooth gradients with sensor-style noise and detail"""
+    corpus = []
+    specs = [
+        ("phone_12mp.jpg", (4032, 3024), "JPEG"),
+        ("camera_6mp.jpg", (3000, 2000), "JPEG"),
+        ("laptop_hd.jpg", (1920, 1080), "JPEG"),
+        ("small.jpg", (800, 600), "JPEG"),
+        ("screenshot.png", (1440, 900), "PNG"),
+        ("transparent.png", (1200, 1200), "PNG"),
+    ]
+    for name, size, fmt in specs:
+        gradient = Image.linear_gradient("L").resize(size)
+        noise = Image.effect_noise(size, 40)
+        detail = Image.effect_mandelbrot(size, (-2.0, -1.2, 0.8, 1.2), 64)
+        image = Image.merge("RGB", (gradient, noise.filter(ImageFilter.GaussianBlur(1)), detail))
+        if name == "transparent.png":
+            image = image.convert("RGBA")
+            image.putalpha(gradient)
+        output = io.BytesIO()
+        image.save(output, format=fmt, quality=95) if fmt == "JPEG" else image.save(output, format=fmt)
+        corpus.append((name, output.getvalue()))
+    return corpus
+
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            with open(os.path.join(directory, name), "rb") as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+
+def timed(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image_dir", nargs="?", help="directory of sample images")
+    parser.add_argument("--max-size-kb", type=int, default=200)
+    parser.add_argument("--max-long-side", type=int, default=1600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.image_dir) if args.image_dir else synthetic_corpus()
+    if not corpus:
+        sys.exit("No images found")
+
+    header = f"{'image':<20} {'input KB':>9} | {'legacy ms':>9} {'enc':>4} {'KB':>5} | {'new ms':>8} {'enc':>4} {'KB':>5} {'q':>3} {'size':>10}"
+    print(header)
+    print("-" * len(header))
+    totals = {"legacy_ms": 0.0, "new_ms": 0.0, "legacy_encodes": 0, "new_encodes": 0}
+    for name, data in corpus:
+        (legacy_out, legacy_encodes), legacy_ms = timed(
+            lambda: legacy_compress_image(data, args.max_size_kb), args.repeat
+        )
+        result, new_ms = timed(
+            lambda: compress_image_with_stats(data, args.max_size_kb, args.max_long_side), args.repeat
+        )
+        totals["legacy_ms"] += legacy_ms
+        totals["new_ms"] += new_ms
+        totals["legacy_encodes"] += legacy_encodes
+        totals["new_encodes"] += result.encodes
+        print(
+            f"{name:<20} {len(data) // 1024:>9} | {legacy_ms:>9.0f} {legacy_encodes:>4} {len(legacy_out) // 1024:>5} | "
+            f"{new_ms:>8.0f} {result.encodes:>4} {len(result.data) // 1024:>5} {result.quality:>3} "
+            f"{result.width:>4}x{result.height:<5}"
+        )
+
+    print("-" * len(header))
+    print(
+        f"total: legacy {totals['legacy_ms']:.0f} ms / {totals['legacy_encodes']} encodes, "
+        f"new {totals['new_ms']:.0f} ms / {totals['new_encodes']} encodes "
+        f"({totals['legacy_ms'] / max(totals['new_ms'], 1e-9):.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the application module.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters,
+reports the cumulative import time and the heaviest top-level packages, and
+exits non-zero when:
+
+  - the best-of-N import time of app.main exceeds --budget-ms, or
+  - a heavy optional dependency (PIL, cloudinary, jose, httpx) is imported, or
+  - importing the app constructs Settings or prints anything.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 1500] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported on first use (upload, login), never by `import app.main`
+DEFERRED_MODULES = ("PIL", "cloudinary", "jose", "httpx")
+
+PROBE = (
+    "import app.main, app.core.config as config; "
+    "assert config.get_settings.cache_info().currsize == 0, 'Settings constructed at import'"
+)
+
+
+def run_once():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    top_level = defaultdict(int)
+    other_stderr = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other_stderr.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        module = name.strip()
+        modules[module] = cumulative_us
+        top_level[module.split(".")[0]] += self_us
+    return proc, modules, top_level, other_stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = []
+    best_ms = None
+    best_top_level = None
+    for _ in range(args.runs):
+        proc, modules, top_level, other_stderr = run_once()
+        if proc.returncode != 0:
+            sys.exit("import failed:\n" + "\n".join(other_stderr))
+        total_ms = modules.get("app.main", 0) / 1000
+        if best_ms is None or total_ms < best_ms:
+            best_ms, best_top_level = total_ms, top_level
+        if proc.stdout.strip():
+            failures.append(f"importing app.main printed output: {proc.stdout.strip()[:200]!r}")
+        loaded = sorted({m.split(".")[0] for m in modules} & set(DEFERRED_MODULES))
+        if loaded:
+            failures.append(f"deferred dependencies imported eagerly: {', '.join(loaded)}")
+
+    print(f"app.main import time (best of {args.runs}): {best_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print("heaviest top-level packages (self time):")
+    for name, self_us in sorted(best_top_level.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"  {name:<24} {self_us / 1000:8.1f} ms")
+
+    if best_ms > args.budget_ms:
+        failures.append(f"import time {best_ms:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    for failure in sorted(set(failures)):
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
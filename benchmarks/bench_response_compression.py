@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of response compression on feed pages: compressed size and
+compression time per encoding for each page size. The time is what every
+request would pay without precompressed cache entries; a hit on an entry
+that already holds the encoding pays none of it.
+
+Usage:
+    python benchmarks/bench_response_compression.py [--sizes 20 100 1000] [--repeat 20]
+
+Encodings whose package is not installed (brotli, zstandard) are skipped.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.compression import get_encoders  # noqa: E402
+from app.core.serialization import dumps, product_to_api  # noqa: E402
+
+
+def make_page(count):
+    """A feed page body as the API serializes it"""
+    base = datetime(2025, 1, 1)
+    docs = [
+        {
+            "_id": ObjectId(),
+            "name": f"Desk lamp #{i}",
+            "description": "Barely used, pickup from the hostel lobby. " * 2,
+            "price": 250.0 + i,
+            "date_added": base + timedelta(seconds=i),
+            "seller_id": "64b7f0c2a1b2c3d4e5f60718",
+            "image_urls": [f"https://res.cloudinary.com/demo/image/upload/v1/products/{i}_{n}.jpg" for n in range(3)],
+            "location": "Hostel 4",
+            "category": "Electronics",
+            "tags": ["lamp", "desk", "study"],
+            "is_sold": False,
+            "revision": 0,
+        }
+        for i in range(count)
+    ]
+    return dumps({"items": [product_to_api(doc) for doc in docs], "next_cursor": None})
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    encoders = get_encoders()
+    print(f"{'items':>6} | {'encoding':>8} | {'bytes':>9} | {'ratio':>6} | {'compress ms':>11}")
+    for size in args.sizes:
+        body = make_page(size)
+        print(f"{size:>6} | {'identity':>8} | {len(body):>9} | {1:>5.1f}x | {0:>11.3f}")
+        for encoder in encoders:
+            compress_ms, data = measure(lambda: encoder.compress(body), args.repeat)
+            print(f"{size:>6} | {encoder.name:>8} | {len(data):>9} | {len(body) / len(data):>5.1f}x | {compress_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the product feed read path: the original Beanie ->
+ProductResponse -> response_model -> JSONResponse chain versus the lean path
+(raw Motor dicts -> product_to_api -> orjson).
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 100 1000 10000] [--repeat 5]
+
+Needs mongomock-motor (benchmarks/requirements.txt) only to initialize Beanie;
+no database is queried, both paths start from the same in-memory documents.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+from app.core.serialization import FastJSONResponse, dumps, product_to_api  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.schema.product import ProductFeedPage, ProductResponse  # noqa: E402
+
+
+def make_docs(count):
+    """Documents shaped like what Motor returns for the products collection"""
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Desk lamp #{i}",
+            "description": "Barely used, pickup from the hostel lobby. " * 2,
+            "price": 250.0 + i,
+            "date_added": base + timedelta(seconds=i),
+            "seller_id": "64b7f0c2a1b2c3d4e5f60718",
+            "image_urls": [f"https://res.cloudinary.com/demo/image/upload/v1/products/{i}_{n}.jpg" for n in range(3)],
+            "location": "Hostel 4",
+            "category": "Electronics",
+            "tags": ["lamp", "desk", "study"],
+            "is_sold": False,
+            "revision": 0,
+        }
+        for i in range(count)
+    ]
+
+
+async def original_path(docs, field):
+    products = [Product.model_validate(doc) for doc in docs]
+    page = ProductFeedPage(
+        items=[ProductResponse.model_validate(p, from_attributes=True) for p in products],
+        next_cursor=None,
+    )
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def lean_path(docs):
+    return FastJSONResponse(None).render({"items": [product_to_api(doc) for doc in docs], "next_cursor": None})
+
+
+async def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    await init_beanie(database=AsyncMongoMockClient()["bench"], document_models=[Product])
+    field = create_model_field(name="Response_bench", type_=ProductFeedPage, mode="serialization")
+
+    print(f"{'items':>7} | {'original ms':>11} | {'lean ms':>8} | {'speedup':>7} | {'bytes':>9}")
+    for size in args.sizes:
+        docs = make_docs(size)
+        original_ms, _ = await measure(lambda: original_path(docs, field), args.repeat)
+        lean_ms, body_size = await measure(lambda: lean_path(docs), args.repeat)
+        print(f"{size:>7} | {original_ms:>11.1f} | {lean_ms:>8.1f} | {original_ms / lean_ms:>6.1f}x | {body_size:>9}")
+
+    # Both paths must produce the same JSON document
+    docs = make_docs(3)
+    assert json.loads(await original_path(docs, field)) == json.loads(dumps(
+        {"items": [product_to_api(doc) for doc in docs], "next_cursor": None}
+    ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
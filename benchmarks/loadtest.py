@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+In-process load test of the API against an in-memory MongoDB stand-in.
+
+Seeds synthetic users and products into mongomock-motor, runs the app's
+startup hooks, then drives it through httpx's ASGI transport with a fixed
+number of concurrent clients per scenario:
+
+  feed    - GET /api/v1/products, following next_cursor and varying filters
+  detail  - GET /api/v1/products/{id} for random seeded products
+  me      - GET /api/v1/auth/me with a bearer token for a random seeded user
+  mine    - GET /api/v1/users/me/products (own listings and seller stats)
+  upload  - POST /api/v1/products (multipart) with generated sample images,
+            stored with the local storage backend in a temporary directory
+
+Results (p50/p95/p99/max latency in ms, req/s, status counts) are written as
+JSON so runs can be compared; pass --baseline with an earlier result to print
+the change per scenario.
+
+Usage:
+    python benchmarks/loadtest.py [--products 5000] [--users 200] [--concurrency 16]
+        [--requests 500] [--upload-requests 40] [--scenarios feed detail me mine upload]
+        [--images DIR] [--output results.json] [--baseline previous.json]
+
+Needs mongomock-motor (benchmarks/requirements.txt). There is no network or
+socket I/O, so numbers measure the application and driver stack only.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CATEGORIES = ["Electronics", "Books", "Furniture", "Clothing", "Sports", "Stationery"]
+LOCATIONS = ["Hostel 1", "Hostel 4", "Library", "Main Gate", "Block C"]
+TAGS = ["lamp", "desk", "study", "cycle", "novel", "chair", "jacket", "cricket", "calculator", "notes"]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, statuses, elapsed):
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "requests": len(latencies_ms),
+        "req_per_s": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 0.50), 2),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 2),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 2),
+        "max_ms": round(latencies_ms[-1], 2) if latencies_ms else 0.0,
+        "mean_ms": round(statistics.fmean(latencies_ms), 2) if latencies_ms else 0.0,
+        "statuses": dict(sorted(Counter(str(s) for s in statuses).items())),
+    }
+
+
+def generated_images(count, rng):
+    """Noisy JPEGs of assorted sizes, roughly like phone photos after resizing"""
+    from PIL import Image
+
+    images = []
+    for i in range(count):
+        side = rng.choice([640, 1024, 1600, 2400])
+        buffer = io.BytesIO()
+        Image.effect_noise((side, side * 3 // 4), 40).convert("RGB").save(buffer, "JPEG", quality=90)
+        images.append((f"sample_{i}.jpg", buffer.getvalue()))
+    return images
+
+
+def load_images(directory):
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
+            with open(os.path.join(directory, name), "rb") as f:
+                images.append((name, f.read()))
+    if not images:
+        sys.exit(f"no images found in {directory}")
+    return images
+
+
+async def seed(product_count, user_count, rng):
+    from app.models.product import Product
+    from app.models.user import User
+
+    users = [
+        User(email=f"student{i}@example.edu", name=f"Student {i}", oauth_provider="google", oauth_id=f"g-{i}")
+        for i in range(user_count)
+    ]
+    await User.insert_many(users)
+    users = await User.find_all().to_list()
+
+    base = datetime.utcnow() - timedelta(days=90)
+    products = [
+        Product(
+            name=f"{rng.choice(TAGS).title()} #{i}",
+            description="Barely used, pickup near campus. " * rng.randint(1, 4),
+            price=round(rng.uniform(50, 20000), 2),
+            date_added=base + timedelta(seconds=i * 60),
+            seller_id=str(rng.choice(users).id),
+            image_urls=[f"https://res.cloudinary.com/demo/image/upload/v1/products/{i}_{n}.jpg" for n in range(rng.randint(1, 4))],
+            location=rng.choice(LOCATIONS),
+            category=rng.choice(CATEGORIES),
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+            is_sold=rng.random() < 0.2,
+        )
+        for i in range(product_count)
+    ]
+    for start in range(0, len(products), 1000):
+        await Product.insert_many(products[start:start + 1000])
+    product_ids = [str(doc["_id"]) async for doc in Product.get_motor_collection().find({}, {"_id": 1})]
+    return [str(user.id) for user in users], product_ids
+
+
+class Scenarios:
+    """Request generators; each call issues one request and returns its status code"""
+
+    def __init__(self, client, rng, user_ids, product_ids, images):
+        from app.core.auth import create_access_token
+
+        self.client = client
+        self.rng = rng
+        self.product_ids = product_ids
+        self.images = images
+        self.tokens = [create_access_token({"sub": user_id}) for user_id in user_ids]
+        self._cursors = []
+
+    async def feed(self):
+        params = {"limit": 20}
+        if self._cursors and self.rng.random() < 0.6:
+            params["cursor"] = self._cursors.pop(self.rng.randrange(len(self._cursors)))
+        elif self.rng.random() < 0.5:
+            params["category"] = self.rng.choice(CATEGORIES)
+        response = await self.client.get("/api/v1/products", params=params)
+        if response.status_code == 200:
+            next_cursor = response.json().get("next_cursor")
+            if next_cursor and len(self._cursors) < 1000:
+                self._cursors.append(next_cursor)
+        return response.status_code
+
+    async def detail(self):
+        response = await self.client.get(f"/api/v1/products/{self.rng.choice(self.product_ids)}")
+        return response.status_code
+
+    def _auth(self):
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    async def me(self):
+        response = await self.client.get("/api/v1/auth/me", headers=self._auth())
+        return response.status_code
+
+    async def mine(self):
+        response = await self.client.get("/api/v1/users/me/products", headers=self._auth())
+        return response.status_code
+
+    async def upload(self):
+        picked = self.rng.sample(self.images, min(len(self.images), self.rng.randint(1, 3)))
+        response = await self.client.post(
+            "/api/v1/products",
+            data={"name": "Load test item", "price": "499", "location": "Library", "category": "Books"},
+            files=[("images", (name, data, "image/jpeg")) for name, data in picked],
+            headers=self._auth(),
+        )
+        return response.status_code
+
+
+async def run_scenario(issue, total, concurrency):
+    latencies_ms, statuses = [], []
+    remaining = total
+
+    async def client_loop():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                status = await issue()
+            except Exception as e:  # count transport/app crashes instead of aborting the run
+                status = type(e).__name__
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+            statuses.append(status)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return summarize(latencies_ms, statuses, time.perf_counter() - started)
+
+
+def compare(results, baseline):
+    print(f"{'scenario':<8} | {'metric':<9} | {'baseline':>9} | {'current':>9} | change", file=sys.stderr)
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "req_per_s"):
+            before, after = previous[metric], current[metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{name:<8} | {metric:<9} | {before:>9} | {after:>9} | {change}", file=sys.stderr)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per read scenario")
+    parser.add_argument("--upload-requests", type=int, default=40)
+    parser.add_argument("--scenarios", nargs="+", default=["feed", "detail", "me", "mine", "upload"],
+                        choices=["feed", "detail", "me", "mine", "upload"])
+    parser.add_argument("--images", help="directory of sample images for the upload scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    media_dir = tempfile.mkdtemp(prefix="loadtest-media-")
+    os.environ.update(IMAGE_STORAGE_BACKEND="local", LOCAL_STORAGE_DIR=media_dir)
+
+    import httpx
+    from beanie import init_beanie
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app.db import session
+    from app.main import app
+    from app.models.image import ImageAsset
+    from app.models.job import ImageJob, ImageUpload
+    from app.models.product import Product
+    from app.models.user import User
+
+    # init_db keeps an already set client, so startup runs against the stand-in
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client["loadtest"], document_models=[Product, User, ImageAsset, ImageJob, ImageUpload])
+    session._client = client
+    # The app's own messages (startup, fallbacks) go to stderr; stdout is for the JSON result
+    with contextlib.redirect_stdout(sys.stderr):
+        await app.router.startup()
+        try:
+            user_ids, product_ids = await seed(args.products, args.users, rng)
+            images = load_images(args.images) if args.images else generated_images(6, rng)
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                scenarios = Scenarios(client, rng, user_ids, product_ids, images)
+                results = {
+                    "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                    "python": platform.python_version(),
+                    "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+                    "scenarios": {},
+                }
+                for name in args.scenarios:
+                    total = args.upload_requests if name == "upload" else args.requests
+                    print(f"running {name}: {total} requests, concurrency {args.concurrency}", file=sys.stderr)
+                    results["scenarios"][name] = await run_scenario(getattr(scenarios, name), total, args.concurrency)
+        finally:
+            await app.router.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
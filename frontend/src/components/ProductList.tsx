@@ -1,11 +1,17 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { getProducts } from '../services/products';
-import type { Product } from '../types/product';
+import { getProduct, getProducts, subscribeToProductEvents } from '../services/products';
+import type { Product, ProductEvent } from '../types/product';
+
+// Rendered card width for each breakpoint of the grid below, so the browser
+// picks the thumbnail or medium rendition instead of the full-size image
+const CARD_IMAGE_SIZES = '(min-width: 1280px) 25vw, (min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw';
 
 export default function ProductList() {
   const [products, setProducts] = useState<Product[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const { state } = useAuth();
 
@@ -13,8 +19,9 @@ export default function ProductList() {
     try {
       setIsLoading(true);
       setError(null);
-      const fetchedProducts = await getProducts();
-      setProducts(fetchedProducts.reverse());
+      const page = await getProducts();
+      setProducts(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch products');
     } finally {
@@ -22,10 +29,59 @@ export default function ProductList() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || isLoadingMore) return;
+    try {
+      setIsLoadingMore(true);
+      setError(null);
+      const page = await getProducts(nextCursor);
+      // Skip items already shown, e.g. ones that arrived as live events
+      setProducts((current) => {
+        const seen = new Set(current.map((p) => p.id));
+        return [...current, ...page.items.filter((p) => !seen.has(p.id))];
+      });
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to fetch products');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchProducts();
   }, []);
 
+  // Ids currently on screen, for event handlers that outlive a render
+  const shownIds = useRef<Set<string>>(new Set());
+  useEffect(() => {
+    shownIds.current = new Set(products.map((p) => p.id));
+  }, [products]);
+
+  // Apply live changes instead of polling the feed
+  useEffect(() => {
+    const upsert = (product: Product, prepend: boolean) =>
+      setProducts((current) =>
+        current.some((p) => p.id === product.id)
+          ? current.map((p) => (p.id === product.id ? product : p))
+          : prepend ? [product, ...current] : current,
+      );
+
+    const handleEvent = (event: ProductEvent) => {
+      if (event.type === 'delete') {
+        setProducts((current) => current.filter((p) => p.id !== event.id));
+      } else if (event.product) {
+        upsert(event.product, event.type === 'insert');
+      } else if (event.type === 'insert' || shownIds.current.has(event.id)) {
+        getProduct(event.id)
+          .then((product) => upsert(product, event.type === 'insert'))
+          .catch(() => undefined);
+      }
+    };
+
+    return subscribeToProductEvents(handleEvent, fetchProducts);
+  }, []);
+
   const formatPrice = (price: number) => {
     return new Intl.NumberFormat('en-US', {
       style: 'currency',
@@ -113,15 +169,39 @@ export default function ProductList() {
           >
             {/* Product Image with Overlay */}
             <div className="aspect-w-16 aspect-h-9 bg-gray-200 relative">
-              {product.image_urls && product.image_urls.length > 0 ? (
+              {product.images && product.images.length > 0 ? (
+                <picture>
+                  {product.images[0].thumb.webp && product.images[0].medium.webp && (
+                    <source
+                      type="image/webp"
+                      srcSet={`${product.images[0].thumb.webp} ${product.images[0].thumb.width}w, ${product.images[0].medium.webp} ${product.images[0].medium.width}w`}
+                      sizes={CARD_IMAGE_SIZES}
+                    />
+                  )}
+                  <img
+                    src={product.images[0].thumb.jpeg}
+                    srcSet={`${product.images[0].thumb.jpeg} ${product.images[0].thumb.width}w, ${product.images[0].medium.jpeg} ${product.images[0].medium.width}w`}
+                    sizes={CARD_IMAGE_SIZES}
+                    width={product.images[0].thumb.width}
+                    height={product.images[0].thumb.height}
+                    loading="lazy"
+                    decoding="async"
+                    alt={product.name}
+                    className="w-full h-48 object-cover"
+                  />
+                </picture>
+              ) : product.image_urls && product.image_urls.length > 0 ? (
                 <img
                   src={product.image_urls[0]}
                   alt={product.name}
+                  loading="lazy"
                   className="w-full h-48 object-cover"
                 />
               ) : (
                 <div className="w-full h-48 bg-gray-200 flex items-center justify-center">
-                  <span className="text-gray-400">No image</span>
+                  <span className="text-gray-400">
+                    {product.image_status === 'processing' ? 'Processing images…' : 'No image'}
+                  </span>
                 </div>
               )}
               
@@ -226,6 +306,19 @@ export default function ProductList() {
         ))}
       </div>
 
+      {/* Older listings, one feed page at a time */}
+      {nextCursor && (
+        <div className="mt-8 text-center">
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="bg-blue-500 text-white px-6 py-2 rounded-md hover:bg-blue-600 transition-colors duration-200 disabled:opacity-60 disabled:cursor-not-allowed"
+          >
+            {isLoadingMore ? 'Loading…' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {/* Product Count */}
       <div className="mt-8 text-center text-gray-600 dark:text-gray-400">
         Showing {products.length} product{products.length !== 1 ? 's' : ''}
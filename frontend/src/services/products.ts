@@ -1,7 +1,19 @@
-import type { Product, CreateProductData } from '../types/product';
+import type {
+  Product,
+  ProductEvent,
+  ProductEventType,
+  ProductFeedPage,
+  SellerListingsPage,
+  CreateProductData,
+} from '../types/product';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8002/api/v1';
 
+const authHeaders = (): Record<string, string> => {
+  const token = localStorage.getItem('access_token');
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
 export const createProduct = async (productData: CreateProductData): Promise<Product> => {
   const formData = new FormData();
   
@@ -22,6 +34,7 @@ export const createProduct = async (productData: CreateProductData): Promise<Pro
 
   const response = await fetch(`${API_BASE_URL}/products`, {
     method: 'POST',
+    headers: authHeaders(),
     body: formData,
   });
 
@@ -32,8 +45,9 @@ export const createProduct = async (productData: CreateProductData): Promise<Pro
   return response.json();
 };
 
-export const getProducts = async (): Promise<Product[]> => {
-  const response = await fetch(`${API_BASE_URL}/products`);
+export const getProducts = async (cursor?: string): Promise<ProductFeedPage> => {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE_URL}/products${query}`);
   
   if (!response.ok) {
     throw new Error(`Failed to fetch products: ${response.statusText}`);
@@ -50,4 +64,39 @@ export const getProduct = async (id: string): Promise<Product> => {
   }
 
   return response.json();
-}; 
\ No newline at end of file
+};
+
+export const getMyListings = async (cursor?: string): Promise<SellerListingsPage> => {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE_URL}/users/me/products${query}`, {
+    headers: authHeaders(),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch your listings: ${response.statusText}`);
+  }
+
+  return response.json();
+};
+
+const PRODUCT_EVENT_TYPES: ProductEventType[] = ['insert', 'update', 'sold', 'delete'];
+
+// Live product changes over Server-Sent Events; returns a function that closes the stream.
+// onResync is called when the server dropped events for this client (it fell behind).
+export const subscribeToProductEvents = (
+  onEvent: (event: ProductEvent) => void,
+  onResync: () => void,
+): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/products/events`);
+
+  PRODUCT_EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (message) => {
+      const data = JSON.parse((message as MessageEvent<string>).data);
+      onEvent({ type, id: data.id, product: data.product });
+    });
+  });
+  // EventSource reconnects on its own; reload to pick up what was missed
+  source.addEventListener('evicted', onResync);
+
+  return () => source.close();
+};
@@ -1,3 +1,16 @@
+export interface ImageVariant {
+  width: number;
+  height: number;
+  jpeg: string;
+  webp: string | null;
+}
+
+export interface ProductImage {
+  full: ImageVariant;
+  medium: ImageVariant;
+  thumb: ImageVariant;
+}
+
 export interface Product {
   id: string;
   name: string;
@@ -6,10 +19,40 @@ export interface Product {
   date_added: string;
   seller_id: string;
   image_urls: string[];
+  images?: ProductImage[];
+  image_status?: 'ready' | 'processing' | 'failed';
   location: string;
   category: string;
   tags?: string[];
   is_sold: boolean;
+  revision: number;
+}
+
+export interface ProductFeedPage {
+  items: Product[];
+  next_cursor: string | null;
+}
+
+export interface SellerStats {
+  active: number;
+  sold: number;
+  total: number;
+  active_value: number;
+  sold_value: number;
+}
+
+export interface SellerListingsPage extends ProductFeedPage {
+  // Only present on the first page
+  stats: SellerStats | null;
+}
+
+export type ProductEventType = 'insert' | 'update' | 'sold' | 'delete';
+
+export interface ProductEvent {
+  type: ProductEventType;
+  id: string;
+  // Missing for deletes and bulk changes; fetch the product when needed
+  product: Product | null;
 }
 
 export interface CreateProductData {
@@ -1,14 +1,67 @@
 #!/usr/bin/env python3
 """
-Simple script to run the FastAPI application
+Script to run the FastAPI application.
+
+    python run.py               # mode from SERVER_MODE (default: dev)
+    python run.py --mode prod   # multi-worker production server
+
+dev:  one process with auto-reload.
+prod: SERVER_WORKERS processes (0 = one per CPU), uvloop/httptools when
+      installed, tuned keep-alive and listen backlog. On SIGTERM each worker
+      stops accepting connections and drains in-flight requests for up to
+      SERVER_GRACEFUL_TIMEOUT_SECONDS before exiting.
 """
+import argparse
+import importlib.util
+import os
+
 import uvicorn
 
-if __name__ == "__main__":
+from app.core.config import settings
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Student Store API")
+    parser.add_argument("--mode", choices=["dev", "prod"], default=settings.SERVER_MODE)
+    args = parser.parse_args()
+
+    if args.mode == "dev":
+        uvicorn.run(
+            "app.main:app",
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            reload=True,
+            log_level="info"
+        )
+        return
+
+    workers = settings.SERVER_WORKERS or os.cpu_count() or 1
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    print(f"Starting {workers} worker(s) on {settings.SERVER_HOST}:{settings.SERVER_PORT} (loop={loop}, http={http})")
+
+    # The app module is imported by each worker; init_db runs in the startup
+    # event of every worker and Cloudinary is configured on first storage use,
+    # never at import time.
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8002,
-        reload=True,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        proxy_headers=True,
+        access_log=False,
         log_level="info"
-    ) 
\ No newline at end of file
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# tests/test_import_time.py
+# Import-time budget for app.main, run in fresh interpreters through
+# benchmarks/bench_import_time.py's probe (python -X importtime).
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_import_time import DEFERRED_MODULES, run_once  # noqa: E402
+
+BUDGET_MS = 1500
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def runs():
+    results = [run_once() for _ in range(RUNS)]
+    for proc, _, _, other_stderr in results:
+        # The probe also asserts that importing the app does not construct Settings
+        assert proc.returncode == 0, "import app.main failed:\n" + "\n".join(other_stderr)
+    return results
+
+
+def test_import_time_within_budget(runs):
+    best_ms = min(modules.get("app.main", 0) for _, modules, _, _ in runs) / 1000
+    assert best_ms <= BUDGET_MS, f"import app.main took {best_ms:.0f} ms (budget {BUDGET_MS} ms)"
+
+
+def test_heavy_dependencies_are_deferred(runs):
+    _, modules, _, _ = runs[0]
+    loaded = sorted({name.split(".")[0] for name in modules} & set(DEFERRED_MODULES))
+    assert not loaded, f"imported eagerly: {', '.join(loaded)}"
+
+
+def test_import_prints_nothing(runs):
+    proc, _, _, _ = runs[0]
+    assert proc.stdout.strip() == ""